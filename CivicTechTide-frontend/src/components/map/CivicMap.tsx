@@ -40,8 +40,12 @@ function ClickHandler({ onMapClick }: { onMapClick: (lat: number, lng: number) =
   return null
 }
 
+// The only report fields a pin reads — pass as `fields` so the map skips descriptions and images
+export const MAP_REPORT_FIELDS = 'id,latitude,longitude,category,title,status,created_at'
+export type MapReport = Pick<Report, 'id' | 'latitude' | 'longitude' | 'category' | 'title' | 'status' | 'created_at'>
+
 interface MapProps {
-  reports: Report[]
+  reports: MapReport[]
   center?: [number, number]
   zoom?: number
   height?: string
@@ -70,18 +70,29 @@ export function VoteButton({ reportId }: { reportId: number }) {
 
 // ── Comments Section ───────────────────────────────────
 
+const PAGE_SIZE = 20
+
 export function CommentsSection({ reportId }: { reportId: number }) {
   const { isAuthenticated, user } = useAuthStore()
   const [comments, setComments] = useState<Comment[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [newComment, setNewComment] = useState('')
   const [loading, setLoading] = useState(false)
+  const [loadingMore, setLoadingMore] = useState(false)
   const [submitting, setSubmitting] = useState(false)
 
+  // Newest first, one page at a time — the API returns the next page's cursor in X-Next-Cursor
+  const fetchPage = (cursor?: string) =>
+    api.get(`/engagement/reports/${reportId}/comments`, {
+      params: { order: 'newest', limit: PAGE_SIZE, ...(cursor ? { cursor } : {}) },
+    })
+
   const loadComments = async () => {
     setLoading(true)
     try {
-      const res = await api.get(`/engagement/reports/${reportId}/comments`)
+      const res = await fetchPage()
       setComments(res.data)
+      setNextCursor(res.headers['x-next-cursor'] ?? null)
     } catch {
       // silently fail
     } finally {
@@ -89,6 +100,20 @@ export function CommentsSection({ reportId }: { reportId: number }) {
     }
   }
 
+  const loadMore = async () => {
+    if (!nextCursor) return
+    setLoadingMore(true)
+    try {
+      const res = await fetchPage(nextCursor)
+      setComments(prev => [...prev, ...res.data])
+      setNextCursor(res.headers['x-next-cursor'] ?? null)
+    } catch {
+      toast.error('Failed to load more comments')
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   useEffect(() => { loadComments() }, [reportId])
 
   const handleSubmit = async () => {
@@ -99,10 +124,12 @@ export function CommentsSection({ reportId }: { reportId: number }) {
     }
     setSubmitting(true)
     try {
-      await api.post(`/engagement/reports/${reportId}/comments`, { content: newComment.trim() })
+      const res = await api.post(`/engagement/reports/${reportId}/comments`, { content: newComment.trim() })
+      // Show the comment from the POST response — a refetch may hit a worker whose
+      // cached first page doesn't have it yet
+      setComments(prev => [res.data, ...prev.filter(c => c.id !== res.data.id)])
       setNewComment('')
       toast.success('Comment added!')
-      loadComments()
     } catch {
       toast.error('Failed to add comment')
     } finally {
@@ -126,7 +153,7 @@ export function CommentsSection({ reportId }: { reportId: number }) {
       <h2 className="section-title mb-5 flex items-center gap-2">
         <MessageCircle size={18} className="text-wave" />
         Comments
-        <span className="text-sm font-normal text-ocean/40">({comments.length})</span>
+        <span className="text-sm font-normal text-ocean/40">({comments.length}{nextCursor ? '+' : ''})</span>
       </h2>
 
       {/* Comment input */}
@@ -207,6 +234,15 @@ export function CommentsSection({ reportId }: { reportId: number }) {
               </div>
             </div>
           ))}
+          {nextCursor && (
+            <button
+              onClick={loadMore}
+              disabled={loadingMore}
+              className="w-full text-sm font-semibold text-wave hover:underline py-2"
+            >
+              {loadingMore ? 'Loading...' : 'Load older comments'}
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -4,21 +4,42 @@ import { reportService } from '../services/report.service'
 import ReportCard from '../components/reports/ReportCard'
 import { useAuthStore } from '../hooks/useAuthStore'
 import { Plus, FileText } from 'lucide-react'
-import type { Report } from '../types'
+import type { Report, ReportStatus } from '../types'
+
+const PAGE_SIZE = 20
 
 export default function DashboardPage() {
   const { user } = useAuthStore()
   const [reports, setReports] = useState<Report[]>([])
+  const [total, setTotal] = useState(0)
+  const [counts, setCounts] = useState<Partial<Record<ReportStatus, number>>>({})
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
 
   useEffect(() => {
-    reportService.getMyReports()
-      .then((data) => setReports(data.reports))
+    reportService.getMyReports({ limit: PAGE_SIZE })
+      .then((data) => {
+        setReports(data.reports)
+        setTotal(data.total)
+        setCounts(data.by_status)
+      })
       .finally(() => setLoading(false))
   }, [])
 
-  const resolved = reports.filter(r => r.status === 'resolved').length
-  const pending  = reports.filter(r => r.status !== 'resolved' && r.status !== 'rejected').length
+  const loadMore = () => {
+    setLoadingMore(true)
+    reportService.getMyReports({ skip: reports.length, limit: PAGE_SIZE })
+      .then((data) => {
+        setReports(prev => [...prev, ...data.reports])
+        setTotal(data.total)
+        setCounts(data.by_status)
+      })
+      .finally(() => setLoadingMore(false))
+  }
+
+  // Counts cover all of the user's reports, not just the page we loaded
+  const resolved = counts.resolved ?? 0
+  const pending  = (counts.reported ?? 0) + (counts.under_review ?? 0) + (counts.in_progress ?? 0)
 
   return (
     <div className="max-w-5xl mx-auto px-4 sm:px-6 lg:px-8 py-10 page-enter">
@@ -37,7 +58,7 @@ export default function DashboardPage() {
       {/* Stats */}
       <div className="grid grid-cols-3 gap-4 mb-10">
         {[
-          { label: 'Total Reports', value: reports.length, color: 'bg-foam text-wave' },
+          { label: 'Total Reports', value: total, color: 'bg-foam text-wave' },
           { label: 'In Progress', value: pending, color: 'bg-orange-50 text-orange-600' },
           { label: 'Resolved', value: resolved, color: 'bg-green-50 text-green-600' },
         ].map(({ label, value, color }) => (
@@ -70,9 +91,18 @@ export default function DashboardPage() {
           </Link>
         </div>
       ) : (
-        <div className="grid sm:grid-cols-2 gap-6">
-          {reports.map((r) => <ReportCard key={r.id} report={r} />)}
-        </div>
+        <>
+          <div className="grid sm:grid-cols-2 gap-6">
+            {reports.map((r) => <ReportCard key={r.id} report={r} />)}
+          </div>
+          {reports.length < total && (
+            <div className="text-center mt-8">
+              <button onClick={loadMore} disabled={loadingMore} className="btn-primary">
+                {loadingMore ? 'Loading...' : `Show more (${total - reports.length} left)`}
+              </button>
+            </div>
+          )}
+        </>
       )}
     </div>
   )
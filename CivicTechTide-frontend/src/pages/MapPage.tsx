@@ -1,16 +1,16 @@
 import { useEffect, useState } from 'react'
 import { reportService } from '../services/report.service'
-import CivicMap from '../components/map/CivicMap'
+import CivicMap, { MAP_REPORT_FIELDS, type MapReport } from '../components/map/CivicMap'
 import LocationSearch from '../components/map/LocationSearch'
 import { categoryLabels, statusLabels } from '../utils/helpers'
-import type { Report, ReportCategory, ReportStatus } from '../types'
+import type { ReportCategory, ReportStatus } from '../types'
 import { Filter } from 'lucide-react'
 
 const categories = Object.entries(categoryLabels) as [ReportCategory, string][]
 const statuses = Object.entries(statusLabels) as [ReportStatus, string][]
 
 export default function MapPage() {
-  const [reports, setReports] = useState<Report[]>([])
+  const [reports, setReports] = useState<MapReport[]>([])
   const [loading, setLoading] = useState(true)
   const [category, setCategory] = useState<ReportCategory | ''>('')
   const [status, setStatus] = useState<ReportStatus | ''>('')
@@ -22,6 +22,7 @@ export default function MapPage() {
     reportService.getAll({
       category: category || undefined,
       status: status || undefined,
+      fields: MAP_REPORT_FIELDS,
     })
       .then((data) => setReports(data.reports))
       .finally(() => setLoading(false))
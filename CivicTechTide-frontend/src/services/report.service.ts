@@ -1,8 +1,8 @@
 import api from './api'
-import type { ReportCategory, ReportStatus } from '../types'
+import type { MyReportListResponse, ReportCategory, ReportStatus } from '../types'
 
 export const reportService = {
-  async getAll(params?: { category?: ReportCategory; status?: ReportStatus }) {
+  async getAll(params?: { category?: ReportCategory; status?: ReportStatus; fields?: string }) {
     const res = await api.get('/reports/', { params })
     return res.data
   },
@@ -12,8 +12,8 @@ export const reportService = {
     return res.data
   },
 
-  async getMyReports() {
-    const res = await api.get('/reports/my/reports')
+  async getMyReports(params?: { skip?: number; limit?: number }): Promise<MyReportListResponse> {
+    const res = await api.get('/reports/my/reports', { params })
     return res.data
   },
 
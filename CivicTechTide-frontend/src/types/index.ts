@@ -56,6 +56,10 @@ export interface ReportListResponse {
   reports: Report[]
 }
 
+export interface MyReportListResponse extends ReportListResponse {
+  by_status: Record<ReportStatus, number>
+}
+
 // ── Forms ─────────────────────────────────────────────
 
 export interface LoginForm {
@@ -86,6 +90,7 @@ export interface DashboardStats {
   total_reports: number
   total_users: number
   resolution_rate: number
+  archived: number
   by_status: Record<ReportStatus, number>
   by_category: Record<ReportCategory, number>
 }
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends
+from collections import Counter
+
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 
 from app.db.database import get_db
 from app.models.report import Report, ReportStatus, ReportCategory
 from app.models.user import User
+from app.models.archive import ArchivedReport
 from app.core.security import get_current_admin
+from app.services.analytics import get_timeseries
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -13,29 +17,38 @@ router = APIRouter(prefix="/admin", tags=["Admin"])
 @router.get("/stats")
 def get_dashboard_stats(admin: User = Depends(get_current_admin), db: Session = Depends(get_db)):
     """Admin dashboard — summary statistics."""
-    total_reports = db.query(Report).count()
     total_users = db.query(User).filter(User.is_admin == False).count()
-    resolved = db.query(Report).filter(Report.status == ReportStatus.RESOLVED).count()
-    in_progress = db.query(Report).filter(Report.status == ReportStatus.IN_PROGRESS).count()
-    under_review = db.query(Report).filter(Report.status == ReportStatus.UNDER_REVIEW).count()
-    pending = db.query(Report).filter(Report.status == ReportStatus.REPORTED).count()
-
-    # Reports per category
-    category_counts = (
-        db.query(Report.category, func.count(Report.id))
-        .group_by(Report.category)
-        .all()
-    )
+
+    # Archived reports still count — archival only moves them out of the hot table
+    by_status, by_category = Counter(), Counter()
+    for model in (Report, ArchivedReport):
+        by_status.update(dict(db.query(model.status, func.count(model.id)).group_by(model.status).all()))
+        by_category.update(dict(db.query(model.category, func.count(model.id)).group_by(model.category).all()))
+    total_reports = sum(by_status.values())
+    resolved = by_status[ReportStatus.RESOLVED]
+    archived = db.query(func.count(ArchivedReport.id)).scalar()
 
     return {
         "total_reports": total_reports,
         "total_users": total_users,
         "by_status": {
-            "reported": pending,
-            "under_review": under_review,
-            "in_progress": in_progress,
+            "reported": by_status[ReportStatus.REPORTED],
+            "under_review": by_status[ReportStatus.UNDER_REVIEW],
+            "in_progress": by_status[ReportStatus.IN_PROGRESS],
             "resolved": resolved,
         },
-        "by_category": {cat.value: count for cat, count in category_counts},
+        "by_category": {cat.value: count for cat, count in by_category.items()},
+        "archived": archived,
         "resolution_rate": round((resolved / total_reports * 100), 1) if total_reports else 0
     }
+
+
+@router.get("/stats/timeseries")
+def get_stats_timeseries(
+    granularity: str = Query("day", pattern="^(day|week)$"),
+    periods: int = Query(30, ge=1, le=366),
+    admin: User = Depends(get_current_admin),
+    db: Session = Depends(get_db)
+):
+    """Admin dashboard — trends per day/week, served from the rollup tables."""
+    return get_timeseries(db, granularity, periods)
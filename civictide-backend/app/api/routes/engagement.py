@@ -1,95 +1,226 @@
-from fastapi import APIRouter, Depends, HTTPException
+import base64
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, Header
+from sqlalchemy import func, literal, select, tuple_
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
 
 from app.db.database import get_db
 from app.models.engagement import Vote, Comment
+from app.models.archive import ArchivedReport, ArchivedVote, ArchivedComment
 from app.models.report import Report
 from app.models.user import User
 from app.schemas.engagement import CommentCreate, CommentOut, VoteOut
 from app.core.security import get_current_user
+from app.services.cache import comment_first_pages
+from app.services import trending, idempotency
 
 router = APIRouter(prefix="/engagement", tags=["Engagement"])
 
 
-# ── Votes ──────────────────────────────────────────────
+def _is_archived(db: Session, report_id: int) -> bool:
+    return db.query(ArchivedReport.id).filter(ArchivedReport.id == report_id).first() is not None
 
-@router.post("/reports/{report_id}/vote", response_model=VoteOut)
-def toggle_vote(report_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    """Toggle vote on a report — upvote if not voted, remove if already voted."""
+
+def _get_open_report(db: Session, report_id: int) -> Report:
     report = db.query(Report).filter(Report.id == report_id).first()
-    if not report:
-        raise HTTPException(status_code=404, detail="Report not found")
+    if report:
+        return report
+    if _is_archived(db, report_id):
+        raise HTTPException(status_code=409, detail="Report is archived")
+    raise HTTPException(status_code=404, detail="Report not found")
 
-    existing_vote = db.query(Vote).filter(
-        Vote.user_id == current_user.id,
-        Vote.report_id == report_id
-    ).first()
 
-    if existing_vote:
-        # Remove vote
-        db.delete(existing_vote)
-        db.commit()
-        user_has_voted = False
-    else:
-        # Add vote
-        vote = Vote(user_id=current_user.id, report_id=report_id)
-        db.add(vote)
-        db.commit()
-        user_has_voted = True
+# ── Votes ──────────────────────────────────────────────
 
-    vote_count = db.query(Vote).filter(Vote.report_id == report_id).count()
-    return VoteOut(report_id=report_id, vote_count=vote_count, user_has_voted=user_has_voted)
+@router.post("/reports/{report_id}/vote", response_model=VoteOut)
+def toggle_vote(
+    report_id: int,
+    idempotency_key: Optional[str] = Header(None, max_length=200),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Toggle vote on a report — upvote if not voted, remove if already voted."""
+    # A retried toggle must not flip the vote back
+    claim = idempotency.claim(
+        db, idempotency_key, current_user.id, "POST /engagement/vote", idempotency.fingerprint(report_id)
+    )
+    if claim.replay:
+        return claim.replay
+
+    try:
+        _get_open_report(db, report_id)
+
+        existing_vote = db.query(Vote).filter(
+            Vote.user_id == current_user.id,
+            Vote.report_id == report_id
+        ).first()
+
+        if existing_vote:
+            # Remove vote
+            trending.record_unvote(db, report_id, existing_vote)
+            db.delete(existing_vote)
+            user_has_voted = False
+        else:
+            # Add vote
+            vote = Vote(user_id=current_user.id, report_id=report_id)
+            db.add(vote)
+            trending.record_vote(db, report_id)
+            user_has_voted = True
+        db.flush()
+
+        vote_count = db.query(Vote).filter(Vote.report_id == report_id).count()
+        data = VoteOut(report_id=report_id, vote_count=vote_count, user_has_voted=user_has_voted)
+        claim.complete(200, data)
+        db.commit()
+    except Exception:
+        claim.release()
+        raise
+    return data
 
 
 @router.get("/reports/{report_id}/votes", response_model=VoteOut)
 def get_votes(report_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     """Get vote count and whether current user has voted."""
+    model = Vote
     vote_count = db.query(Vote).filter(Vote.report_id == report_id).count()
-    user_has_voted = db.query(Vote).filter(
-        Vote.user_id == current_user.id,
-        Vote.report_id == report_id
+    # Only a report without hot votes can be archived — skip the lookup otherwise
+    if vote_count == 0 and _is_archived(db, report_id):
+        model = ArchivedVote
+        vote_count = db.query(model).filter(model.report_id == report_id).count()
+    user_has_voted = db.query(model).filter(
+        model.user_id == current_user.id,
+        model.report_id == report_id
     ).first() is not None
     return VoteOut(report_id=report_id, vote_count=vote_count, user_has_voted=user_has_voted)
 
 
 # ── Comments ───────────────────────────────────────────
 
-@router.get("/reports/{report_id}/comments", response_model=list[CommentOut])
-def get_comments(report_id: int, db: Session = Depends(get_db)):
-    """Get all comments for a report — public."""
-    comments = db.query(Comment).filter(Comment.report_id == report_id).order_by(Comment.created_at.asc()).all()
-    result = []
-    for c in comments:
+def _encode_cursor(comment: Comment) -> str:
+    raw = f"{comment.created_at.isoformat()}|{comment.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, comment_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(comment_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _comment_page(db: Session, report_id: int, order: str, limit: int, cursor: Optional[str], model=Comment):
+    # Author names come from the same query — no lazy c.user load per comment
+    query = (
+        db.query(model, User.full_name)
+        .outerjoin(User, User.id == model.user_id)
+        .filter(model.report_id == report_id)
+    )
+    position = tuple_(model.created_at, model.id)
+    if cursor:
+        created_at, comment_id = _decode_cursor(cursor)
+        # Compare against the stored timestamp, not the one round-tripped through the
+        # cursor: SQLite stores '…:38' but binds '…:38.000000', which would skip or
+        # repeat rows sharing a second. The encoded value only covers a deleted row,
+        # formatted the way SQLite's CURRENT_TIMESTAMP default stores whole seconds.
+        if db.bind.dialect.name == "sqlite" and created_at.microsecond == 0:
+            created_at = literal(created_at.strftime("%Y-%m-%d %H:%M:%S"))
+        stored = select(model.created_at).where(model.id == comment_id).scalar_subquery()
+        after = tuple_(func.coalesce(stored, created_at), comment_id)
+        query = query.filter(position < after if order == "newest" else position > after)
+    if order == "newest":
+        query = query.order_by(model.created_at.desc(), model.id.desc())
+    else:
+        query = query.order_by(model.created_at.asc(), model.id.asc())
+
+    rows = query.limit(limit + 1).all()
+    comments = []
+    for c, full_name in rows[:limit]:
         data = CommentOut.model_validate(c)
-        data.author_name = c.user.full_name if c.user else "Anonymous"
-        result.append(data)
-    return result
+        data.author_name = full_name or "Anonymous"
+        comments.append(data)
+    next_cursor = _encode_cursor(rows[limit - 1][0]) if len(rows) > limit else None
+    return comments, next_cursor
+
+
+def _thread_page(db: Session, report_id: int, order: str, limit: int, cursor: Optional[str]):
+    page = _comment_page(db, report_id, order, limit, cursor)
+    # An empty page is the only case where the thread may have moved to archived_comments
+    if not page[0] and _is_archived(db, report_id):
+        page = _comment_page(db, report_id, order, limit, cursor, model=ArchivedComment)
+    return page
+
+
+@router.get("/reports/{report_id}/comments", response_model=list[CommentOut])
+def get_comments(
+    report_id: int,
+    response: Response,
+    order: str = Query("oldest", pattern="^(oldest|newest)$"),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a page of comments for a report — public.
+    Pass the X-Next-Cursor response header back as `cursor` for the next page.
+    """
+    if cursor is None:
+        version = comment_first_pages.version(report_id)
+        pages = comment_first_pages.get(report_id)
+        page = pages.get((order, limit)) if pages else None
+        if page is None:
+            page = _thread_page(db, report_id, order, limit, None)
+            # Dropped if a comment write invalidated the thread while we were querying
+            comment_first_pages.set(report_id, {**(pages or {}), (order, limit): page}, version=version)
+    else:
+        page = _thread_page(db, report_id, order, limit, cursor)
+
+    comments, next_cursor = page
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return comments
 
 
 @router.post("/reports/{report_id}/comments", response_model=CommentOut, status_code=201)
 def add_comment(
     report_id: int,
     payload: CommentCreate,
+    idempotency_key: Optional[str] = Header(None, max_length=200),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Add a comment to a report."""
-    report = db.query(Report).filter(Report.id == report_id).first()
-    if not report:
-        raise HTTPException(status_code=404, detail="Report not found")
-
-    comment = Comment(
-        content=payload.content,
-        user_id=current_user.id,
-        report_id=report_id
+    claim = idempotency.claim(
+        db, idempotency_key, current_user.id, "POST /engagement/comments",
+        idempotency.fingerprint(report_id, payload.content),
     )
-    db.add(comment)
-    db.commit()
-    db.refresh(comment)
-
-    data = CommentOut.model_validate(comment)
-    data.author_name = current_user.full_name
+    if claim.replay:
+        return claim.replay
+
+    try:
+        _get_open_report(db, report_id)
+
+        comment = Comment(
+            content=payload.content,
+            user_id=current_user.id,
+            report_id=report_id
+        )
+        db.add(comment)
+        trending.record_comment(db, report_id)
+        db.flush()
+        db.refresh(comment)
+
+        data = CommentOut.model_validate(comment)
+        data.author_name = current_user.full_name
+        claim.complete(201, data)
+        db.commit()
+    except Exception:
+        claim.release()
+        raise
+    comment_first_pages.pop(report_id)
     return data
 
 
@@ -105,5 +236,8 @@ def delete_comment(
         raise HTTPException(status_code=404, detail="Comment not found")
     if comment.user_id != current_user.id and not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Not allowed")
+    report_id = comment.report_id
+    trending.record_uncomment(db, report_id, comment)
     db.delete(comment)
     db.commit()
+    comment_first_pages.pop(report_id)
@@ -1,6 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query, Header
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import func, select, union_all
+from sqlalchemy.orm import Session, joinedload
 from typing import Optional
+from collections import Counter
+import hashlib
+import logging
 import cloudinary
 import cloudinary.uploader
 
@@ -8,12 +15,17 @@ from app.db.database import get_db
 from app.models.report import Report, ReportCategory, ReportStatus
 from app.models.user import User
 from app.models.engagement import Vote, Comment
-from app.schemas.report import ReportCreate, ReportUpdate, ReportOut, ReportListOut
+from app.models.archive import ArchivedReport
+from app.schemas.report import ReportCreate, ReportUpdate, ReportOut, ReportListOut, MyReportListOut
 from app.core.security import get_current_user, get_current_admin
 from app.core.config import settings
+from app.core.metrics import UPLOAD_DURATION, timed
 from app.services.email import send_status_update_email, send_new_report_email
+from app.services import analytics, trending, idempotency
+from app.services.cache import comment_first_pages
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
+logger = logging.getLogger(__name__)
 
 cloudinary.config(
     cloud_name=settings.CLOUDINARY_CLOUD_NAME,
@@ -26,8 +38,49 @@ def send_email_safe(fn, *args):
     """Send email directly — background threads get killed on Render free tier."""
     try:
         fn(*args)
-    except Exception as e:
-        print(f"❌ Email error: {e}")
+    except Exception:
+        logger.exception("email error", extra={"email_fn": fn.__name__})
+
+
+# ── Sparse field selection ─────────────────────────────
+
+REPORT_FIELDS = tuple(ReportOut.model_fields)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[list[str]]:
+    """
+    `fields=id,title,status` → the ReportOut fields to return, in schema order.
+    None means the full representation. `id` is always included.
+    """
+    if not fields:
+        return None
+    requested = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = sorted(requested - set(REPORT_FIELDS))
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return [f for f in REPORT_FIELDS if f == "id" or f in requested]
+
+
+def report_query(db: Session, selected: Optional[list[str]], model=Report):
+    """
+    Full rows with their author in the same SELECT, or — for a sparse request — only
+    the selected columns, joining users only when author_name is asked for.
+    `model` is Report or ArchivedReport.
+    """
+    if selected is None:
+        return db.query(model).options(joinedload(model.author))
+    query = db.query(*(getattr(model, f) for f in selected if f != "author_name"))
+    if "author_name" in selected:
+        query = query.add_columns(User.full_name.label("author_name")).outerjoin(User, User.id == model.user_id)
+    return query
+
+
+def serialize_report(row, selected: Optional[list[str]]):
+    if selected is None:
+        data = ReportOut.model_validate(row)
+        data.author_name = row.author.full_name if row.author else None
+        return data
+    return row._asdict()
 
 
 # ── Public routes ──────────────────────────────────────
@@ -36,42 +89,89 @@ def send_email_safe(fn, *args):
 def get_all_reports(
     category: Optional[ReportCategory] = None,
     status: Optional[ReportStatus] = None,
+    sort: str = Query("newest", pattern="^(newest|trending)$"),
     skip: int = Query(0, ge=0),
-    limit: int = Query(50, le=100),
+    limit: int = Query(50, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated ReportOut fields, e.g. id,latitude,longitude,status"),
     db: Session = Depends(get_db)
 ):
-    query = db.query(Report)
+    selected = parse_fields(fields)
+    filters = []
     if category:
-        query = query.filter(Report.category == category)
+        filters.append(Report.category == category)
     if status:
-        query = query.filter(Report.status == status)
+        filters.append(Report.status == status)
 
-    total = query.count()
-    reports = query.order_by(Report.created_at.desc()).offset(skip).limit(limit).all()
+    total = db.query(func.count(Report.id)).filter(*filters).scalar()
+    query = report_query(db, selected).filter(*filters)
+    if sort == "trending":
+        query = query.order_by(Report.trending_score.desc(), Report.id.desc())
+    else:
+        query = query.order_by(Report.created_at.desc())
+    reports = [serialize_report(r, selected) for r in query.offset(skip).limit(limit).all()]
 
-    result = []
-    for r in reports:
-        data = ReportOut.model_validate(r)
-        data.author_name = r.author.full_name if r.author else None
-        result.append(data)
+    if selected is not None:
+        # Sparse rows are plain dicts — skip response_model, which would demand every field
+        return JSONResponse(jsonable_encoder({"total": total, "reports": reports}))
+    return ReportListOut(total=total, reports=reports)
 
-    return ReportListOut(total=total, reports=result)
 
-
-@router.get("/my/reports", response_model=ReportListOut)
-def get_my_reports(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    reports = db.query(Report).filter(Report.user_id == current_user.id).order_by(Report.created_at.desc()).all()
-    result = [ReportOut.model_validate(r) for r in reports]
-    return ReportListOut(total=len(result), reports=result)
+@router.get("/my/reports", response_model=MyReportListOut)
+def get_my_reports(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # One grouped query per table for the dashboard summary instead of loading every row.
+    # Archived reports are still the user's — count them like get_dashboard_stats does.
+    counts = Counter()
+    for model in (Report, ArchivedReport):
+        counts.update(dict(
+            db.query(model.status, func.count(model.id))
+            .filter(model.user_id == current_user.id)
+            .group_by(model.status)
+            .all()
+        ))
+
+    # Page over both tables so the pager reaches the archived reports the total counts
+    columns = [f for f in REPORT_FIELDS if f != "author_name"]
+    mine = union_all(*(
+        select(*(getattr(model, f) for f in columns)).where(model.user_id == current_user.id)
+        for model in (Report, ArchivedReport)
+    )).subquery()
+    rows = db.execute(
+        select(mine)
+        .order_by(mine.c.created_at.desc(), mine.c.id.desc())
+        .offset(skip)
+        .limit(limit)
+    ).all()
+
+    result = [ReportOut(**row._mapping, author_name=current_user.full_name) for row in rows]
+
+    return MyReportListOut(
+        total=sum(counts.values()),
+        reports=result,
+        by_status={status: counts.get(status, 0) for status in ReportStatus},
+    )
 
 
 @router.get("/{report_id}", response_model=ReportOut)
-def get_report(report_id: int, db: Session = Depends(get_db)):
-    report = db.query(Report).filter(Report.id == report_id).first()
+def get_report(
+    report_id: int,
+    fields: Optional[str] = Query(None, description="Comma-separated ReportOut fields"),
+    db: Session = Depends(get_db),
+):
+    selected = parse_fields(fields)
+    report = report_query(db, selected).filter(Report.id == report_id).first()
+    if not report:
+        # Closed reports are moved out of the hot table by app.services.archive
+        report = report_query(db, selected, ArchivedReport).filter(ArchivedReport.id == report_id).first()
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
-    data = ReportOut.model_validate(report)
-    data.author_name = report.author.full_name if report.author else None
+    data = serialize_report(report, selected)
+    if selected is not None:
+        return JSONResponse(jsonable_encoder(data))
     return data
 
 
@@ -86,37 +186,62 @@ async def create_report(
     longitude: float = Form(...),
     address: Optional[str] = Form(None),
     image: Optional[UploadFile] = File(None),
+    idempotency_key: Optional[str] = Header(None, max_length=200),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    image_url = None
-    image_public_id = None
-
-    if image:
-        try:
-            contents = await image.read()
-            upload_result = cloudinary.uploader.upload(
-                contents, folder="civictide/reports", resource_type="image"
-            )
-            image_url = upload_result.get("secure_url")
-            image_public_id = upload_result.get("public_id")
-        except Exception as e:
-            print(f"Image upload failed: {e}")
-
-    report = Report(
-        title=title,
-        description=description,
-        category=category,
-        latitude=latitude,
-        longitude=longitude,
-        address=address,
-        image_url=image_url,
-        image_public_id=image_public_id,
-        user_id=current_user.id
+    contents = await image.read() if image else None
+
+    # A retried submission gets the first attempt's response — no second upload, row or email
+    claim = await run_in_threadpool(
+        idempotency.claim, db, idempotency_key, current_user.id, "POST /reports",
+        idempotency.fingerprint(
+            title, description, category, latitude, longitude, address,
+            hashlib.sha256(contents).hexdigest() if contents else None,
+        ),
     )
-    db.add(report)
-    db.commit()
-    db.refresh(report)
+    if claim.replay:
+        return claim.replay
+
+    try:
+        image_url = None
+        image_public_id = None
+
+        if contents:
+            try:
+                with timed(UPLOAD_DURATION):
+                    upload_result = cloudinary.uploader.upload(
+                        contents, folder="civictide/reports", resource_type="image"
+                    )
+                image_url = upload_result.get("secure_url")
+                image_public_id = upload_result.get("public_id")
+            except Exception:
+                logger.exception("image upload failed", extra={"size_bytes": len(contents)})
+
+        report = Report(
+            title=title,
+            description=description,
+            category=category,
+            latitude=latitude,
+            longitude=longitude,
+            address=address,
+            image_url=image_url,
+            image_public_id=image_public_id,
+            user_id=current_user.id
+        )
+        trending.record_new_report(report)
+        db.add(report)
+        db.flush()
+        db.refresh(report)  # load created_at for the rollups and the response
+        analytics.record_report_created(db, report)
+
+        data = ReportOut.model_validate(report)
+        data.author_name = current_user.full_name
+        claim.complete(201, data)
+        db.commit()
+    except Exception:
+        claim.release()
+        raise
 
     # Notify all admins by email
     admins = db.query(User).filter(User.is_admin == True).all()
@@ -129,8 +254,6 @@ async def create_report(
             current_user.full_name
         )
 
-    data = ReportOut.model_validate(report)
-    data.author_name = current_user.full_name
     return data
 
 
@@ -147,10 +270,12 @@ def update_report_status(
     if not report:
         raise HTTPException(status_code=404, detail="Report not found")
 
+    old_status = report.status
     report.status = payload.status
     if payload.resolution_notes:
         report.resolution_notes = payload.resolution_notes
 
+    analytics.record_status_change(db, report, old_status, changed_by=admin.id)
     db.commit()
     db.refresh(report)
 
@@ -184,6 +309,8 @@ def delete_report(
     # Delete related votes and comments first to avoid foreign key errors
     db.query(Vote).filter(Vote.report_id == report_id).delete()
     db.query(Comment).filter(Comment.report_id == report_id).delete()
+    analytics.record_report_deleted(db, report)
 
     db.delete(report)
-    db.commit()
\ No newline at end of file
+    db.commit()
+    comment_first_pages.pop(report_id)
\ No newline at end of file
@@ -0,0 +1,164 @@
+"""
+Response compression for the JSON list payloads.
+
+Brotli when the client accepts it and the optional `brotli` package is installed,
+gzip otherwise. Bodies smaller than COMPRESSION_MINIMUM_SIZE go out as-is — below
+about a kilobyte the framing overhead eats most of the saving and the CPU is wasted.
+Bodies that already carry a Content-Encoding, or whose type doesn't compress
+(images, archives), are passed through untouched.
+
+Streaming responses are compressed chunk by chunk and lose their Content-Length.
+"""
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional — gzip only
+    brotli = None
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+
+def accepted_encodings(header: str) -> set[str]:
+    """Parse Accept-Encoding, dropping anything the client marked q=0."""
+    accepted = set()
+    for item in header.split(","):
+        name, _, params = item.strip().partition(";")
+        name = name.strip().lower()
+        q = params.strip().removeprefix("q=")
+        try:
+            if params and float(q) == 0:
+                continue
+        except ValueError:
+            continue
+        if name:
+            accepted.add(name)
+    return accepted
+
+
+class GzipCompressor:
+    encoding = "gzip"
+
+    def __init__(self, level: int):
+        self._z = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip framing
+
+    def compress(self, data: bytes) -> bytes:
+        return self._z.compress(data)
+
+    def flush(self) -> bytes:
+        return self._z.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._z.flush()
+
+
+class BrotliCompressor:
+    encoding = "br"
+
+    def __init__(self, quality: int):
+        self._b = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._b.process(data)
+
+    def flush(self) -> bytes:
+        return self._b.flush()
+
+    def finish(self) -> bytes:
+        return self._b.finish()
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 4):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    def compressor_for(self, scope: Scope):
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            return lambda: BrotliCompressor(self.brotli_quality)
+        if "gzip" in accepted:
+            return lambda: GzipCompressor(self.gzip_level)
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        make_compressor = self.compressor_for(scope)
+        if make_compressor is None:
+            await self.app(scope, receive, send)
+            return
+        await CompressionResponder(self.app, make_compressor, self.minimum_size)(scope, receive, send)
+
+
+class CompressionResponder:
+    """
+    Holds back http.response.start until the first body chunk shows whether the
+    response is worth compressing, then rewrites the headers accordingly.
+    """
+
+    def __init__(self, app: ASGIApp, make_compressor, minimum_size: int):
+        self.app = app
+        self.make_compressor = make_compressor
+        self.minimum_size = minimum_size
+        self.send: Send = None
+        self.start: Message = None
+        self.compressor = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def send_compressed(self, message: Message):
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        if self.start is not None:
+            await self.send_first_chunk(message)
+            return
+        if self.compressor is None:
+            await self.send(message)
+            return
+
+        more_body = message.get("more_body", False)
+        body = self.compressor.compress(message.get("body", b""))
+        body += self.compressor.flush() if more_body else self.compressor.finish()
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
+
+    async def send_first_chunk(self, message: Message):
+        start, self.start = self.start, None
+        headers = MutableHeaders(raw=start["headers"])
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        content_type = headers.get("content-type", "")
+        if ("content-encoding" in headers
+                or not content_type.startswith(COMPRESSIBLE_TYPES)
+                or (not more_body and len(body) < self.minimum_size)):
+            await self.send(start)
+            await self.send(message)
+            return
+
+        self.compressor = self.make_compressor()
+        body = self.compressor.compress(body)
+        body += self.compressor.flush() if more_body else self.compressor.finish()
+
+        headers["Content-Encoding"] = self.compressor.encoding
+        headers.add_vary_header("Accept-Encoding")
+        if more_body:
+            if "content-length" in headers:
+                del headers["content-length"]
+        else:
+            headers["Content-Length"] = str(len(body))
+
+        await self.send(start)
+        await self.send({"type": "http.response.body", "body": body, "more_body": more_body})
@@ -0,0 +1,102 @@
+"""
+Run the periodic background jobs in one process only.
+
+Under app.serve every worker runs app.main's lifespan. Without coordination, the
+trending decay, the idempotency purge and archival would each run once per worker.
+Every live report would be rewritten N times per interval, and archive batches would
+race each other on SQLite, which has no SKIP LOCKED.
+
+Each job first waits for the jobs lock. The first process to take it runs them all.
+The others retry every JOBS_LEADER_RETRY_SECONDS, so if that process dies, another
+worker takes over.
+
+* Postgres — a session advisory lock, held on a dedicated connection outside the
+  request pool. It also coordinates several hosts.
+* Anything else — an flock on a file in the temp directory (or `lock_dir`), which
+  covers one host.
+"""
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+from typing import Optional
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.db.database import connect_args
+
+try:
+    import fcntl
+except ImportError:  # Windows — single-process development only
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+ADVISORY_LOCK_KEY = 0x43495649_4A4F4253  # "CIVIJOBS"
+
+
+class JobsLock:
+    def __init__(self, database_url: str, connect_args: dict, lock_dir: Optional[str] = None):
+        self.database_url = database_url
+        self.connect_args = connect_args
+        self.lock_dir = lock_dir or tempfile.gettempdir()
+        self._held = None  # the connection or file that keeps the lock
+        self._mutex = threading.Lock()
+
+    def acquire(self) -> bool:
+        """Non-blocking. True if this process holds the lock (now or already)."""
+        with self._mutex:
+            if self._held is None:
+                self._held = self._try_lock()
+            return self._held is not None
+
+    def release(self):
+        with self._mutex:
+            if self._held is not None and self._held is not True:
+                self._held.close()  # closing the session / file drops the lock
+            self._held = None
+
+    def _try_lock(self):
+        if self.database_url.startswith("postgresql"):
+            engine = create_engine(self.database_url, poolclass=NullPool, connect_args=self.connect_args)
+            conn = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+            try:
+                if conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": ADVISORY_LOCK_KEY}).scalar():
+                    return conn
+            except Exception:
+                conn.close()
+                raise
+            conn.close()
+            return None
+
+        if fcntl is None:
+            return True
+        digest = hashlib.sha1(self.database_url.encode()).hexdigest()[:12]
+        lock_file = open(os.path.join(self.lock_dir, f"civictide-jobs-{digest}.lock"), "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return lock_file
+        except BlockingIOError:
+            lock_file.close()
+            return None
+
+
+jobs_lock = JobsLock(settings.DATABASE_URL, connect_args)
+
+
+async def run_as_leader(loop):
+    """Wait until this process holds the jobs lock, then run `loop` — an endless job coroutine."""
+    while True:
+        try:
+            if await run_in_threadpool(jobs_lock.acquire):
+                break
+        except Exception:
+            logger.exception("jobs lock check failed")
+        await asyncio.sleep(settings.JOBS_LEADER_RETRY_SECONDS)
+    logger.info("running periodic job", extra={"job": f"{loop.__module__}.{loop.__name__}"})
+    await loop()
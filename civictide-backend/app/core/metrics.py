@@ -0,0 +1,226 @@
+"""
+Prometheus metrics for request latency, DB usage and slow external calls.
+
+MetricsMiddleware opens a per-request RequestStats in a context variable; the
+SQLAlchemy cursor events registered by instrument_engine() add to it from
+whichever threadpool thread runs the query (contextvars are copied into the
+threadpool, so they see the same object). Everything is exposed on /metrics.
+
+Under app.serve every worker writes to PROMETHEUS_MULTIPROC_DIR and /metrics
+aggregates them, so gauges are set explicitly rather than via set_function().
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, generate_latest, multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# ── Metric definitions ─────────────────────────────────
+
+REQUEST_LATENCY = Histogram(
+    "civictide_http_request_duration_seconds", "HTTP request latency",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "civictide_http_requests_in_flight", "HTTP requests currently being served", multiprocess_mode="livesum"
+)
+REQUESTS_REJECTED = Counter(
+    "civictide_http_requests_rejected_total", "Requests rejected by admission control", ["reason", "route"]
+)
+
+SQL_STATEMENTS = Histogram(
+    "civictide_sql_statements_per_request", "SQL statements executed per request",
+    ["route"], buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+)
+SQL_TIME = Histogram(
+    "civictide_sql_seconds_per_request", "Time spent in SQL per request",
+    ["route"], buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5),
+)
+
+DB_POOL_WAIT = Histogram(
+    "civictide_db_pool_checkout_wait_seconds", "Time spent waiting for a pooled DB connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "civictide_db_pool_checked_out", "DB connections currently checked out", multiprocess_mode="livesum"
+)
+DB_POOL_UTILIZATION = Gauge(
+    "civictide_db_pool_utilization_ratio", "Checked-out connections / (pool_size + max_overflow), busiest worker",
+    multiprocess_mode="livemax",
+)
+
+EMAIL_DURATION = Histogram("civictide_email_send_seconds", "Time spent sending one email", ["outcome"])
+UPLOAD_DURATION = Histogram("civictide_image_upload_seconds", "Time spent uploading one image", ["outcome"])
+
+ARCHIVE_ROWS = Counter("civictide_archive_rows_total", "Rows moved into the archive tables", ["table"])
+ARCHIVE_BATCH_DURATION = Histogram(
+    "civictide_archive_batch_seconds", "Time spent archiving one batch of reports", ["outcome"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+ARCHIVE_PENDING = Gauge(
+    "civictide_archive_pending_reports", "Reports still eligible for archival in the current run",
+    multiprocess_mode="mostrecent",
+)
+ARCHIVE_LAST_SUCCESS = Gauge(
+    "civictide_archive_last_success_timestamp_seconds", "When an archive run last finished",
+    multiprocess_mode="max",
+)
+
+
+# ── Per-request SQL accounting ─────────────────────────
+
+def route_template(routes, scope: Scope) -> str:
+    """The template of the route `scope` would be dispatched to, for requests rejected before routing."""
+    for route in routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+
+class RequestStats:
+    __slots__ = ("scope", "routes", "sql_count", "sql_seconds")
+
+    def __init__(self, scope: Scope, routes=()):
+        self.scope = scope
+        self.routes = routes
+        self.sql_count = 0
+        self.sql_seconds = 0.0
+
+    @property
+    def route(self) -> str:
+        # FastAPI records the matched APIRoute on the scope — use its template, not the raw path.
+        # A 429/503 never got that far, so look the template up instead.
+        route = self.scope.get("route")
+        return route.path if route is not None else route_template(self.routes, self.scope)
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited (including any new connect)."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(time.perf_counter() - start)
+
+
+def instrument_engine(engine):
+    def update_pool_gauges(adjust: int = 0):
+        pool = engine.pool  # looked up each time — dispose() after fork replaces it
+        if isinstance(pool, QueuePool):
+            checked_out = pool.checkedout() + adjust
+            capacity = pool.size() + pool._max_overflow
+            DB_POOL_CHECKED_OUT.set(checked_out)
+            DB_POOL_UTILIZATION.set(checked_out / capacity if capacity else 0)
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        update_pool_gauges()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        # Fired just before the connection is handed back to the pool
+        update_pool_gauges(adjust=-1)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start"].pop()
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.sql_count += 1
+            stats.sql_seconds += elapsed
+        if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+            logger.warning(
+                "slow query",
+                extra={
+                    "duration_ms": round(elapsed * 1000, 1),
+                    "route": stats.route if stats else None,
+                    "statement": statement,
+                },
+            )
+
+
+@contextmanager
+def timed(histogram: Histogram):
+    """Observe the block's duration on `histogram`, labelled outcome=ok|error."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        histogram.labels(outcome=outcome).observe(time.perf_counter() - start)
+
+
+# ── Middleware & exposition ────────────────────────────
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, routes=()):
+        self.app = app
+        self.routes = routes
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope, self.routes)
+        token = _request_stats.set(stats)
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            REQUESTS_IN_FLIGHT.dec()
+            _request_stats.reset(token)
+
+            route = stats.route
+            REQUEST_LATENCY.labels(scope["method"], route, str(status_code)).observe(elapsed)
+            SQL_STATEMENTS.labels(route).observe(stats.sql_count)
+            SQL_TIME.labels(route).observe(stats.sql_seconds)
+
+
+def render_metrics() -> tuple[bytes, str]:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(), CONTENT_TYPE_LATEST
+
+
+def mark_worker_dead(pid: int):
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.mark_process_dead(pid)
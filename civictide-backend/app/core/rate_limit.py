@@ -0,0 +1,218 @@
+"""
+Request admission control for the write endpoints.
+
+Two plain ASGI middlewares, so a rejected request never reaches routing, the
+threadpool or the DB pool:
+
+* RateLimitMiddleware — token bucket per (route, user id or client IP), with the
+  per-route limits taken from settings.RATE_LIMITS.
+* ConcurrencyLimitMiddleware — sheds load with a 503 once MAX_CONCURRENT_REQUESTS
+  are already in flight, instead of letting them queue behind the threadpool.
+
+Bucket state lives in a pluggable store: InMemoryStore for a single process,
+RedisStore when several workers must share limits. RedisStore accepts any
+redis.asyncio-compatible client, so a local stand-in (e.g. fakeredis) can replace it.
+"""
+import logging
+import math
+import re
+import time
+
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.metrics import REQUESTS_REJECTED, route_template
+from app.core.security import decode_token
+
+logger = logging.getLogger(__name__)
+
+PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+# ── Storage ────────────────────────────────────────────
+
+class InMemoryStore:
+    """Bucket state in a dict — only correct when the app runs as a single process."""
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self.buckets: dict[str, tuple[float, float, float]] = {}  # key -> (tokens, updated_at, full_at)
+
+    async def take(self, key: str, capacity: int, rate: float) -> float:
+        """Take one token. Returns 0 if allowed, otherwise seconds until a token is available."""
+        now = time.monotonic()
+        tokens, updated_at, _ = self.buckets.get(key, (capacity, now, now))
+        tokens = min(capacity, tokens + (now - updated_at) * rate)
+
+        retry_after = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            retry_after = (1 - tokens) / rate
+
+        if len(self.buckets) >= self.max_keys and key not in self.buckets:
+            self._evict(now)
+        self.buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+        return retry_after
+
+    def _evict(self, now: float):
+        # A bucket that has refilled completely is the same as no bucket at all
+        self.buckets = {k: v for k, v in self.buckets.items() if v[2] > now}
+
+
+class RedisStore:
+    """Bucket state in Redis, shared by every worker. The update is one atomic Lua call."""
+
+    SCRIPT = """
+    local capacity = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(state[1]) or capacity
+    local ts = tonumber(state[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+    local allowed = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+    return {allowed, tostring(tokens)}
+    """
+
+    def __init__(self, client, prefix: str = "civictide:ratelimit:"):
+        self.client = client
+        self.prefix = prefix
+        self.script = client.register_script(self.SCRIPT)
+
+    async def take(self, key: str, capacity: int, rate: float) -> float:
+        allowed, tokens = await self.script(keys=[self.prefix + key], args=[capacity, rate])
+        if int(allowed):
+            return 0.0
+        return (1 - float(tokens)) / rate
+
+
+def get_rate_limit_store(url: str):
+    if url.startswith("memory://"):
+        return InMemoryStore()
+    if url.startswith(("redis://", "rediss://")):
+        import redis.asyncio as redis  # optional dependency, only needed for a shared store
+        return RedisStore(redis.Redis.from_url(url))
+    raise ValueError(f"Unsupported RATE_LIMIT_STORAGE_URL: {url}")
+
+
+# ── Rules ──────────────────────────────────────────────
+
+class RateLimitRule:
+    """A "POST /api/reports/{report_id}/vote" -> "30/minute" entry from settings.RATE_LIMITS."""
+
+    def __init__(self, route: str, limit: str):
+        self.name = route
+        self.method, path = route.split(" ", 1)
+        self.route = path  # the FastAPI route template, as in the request metrics
+        pattern = re.sub(r"\{[^/}]+\}", "[^/]+", path.rstrip("/"))
+        self.path = re.compile(f"^{pattern}/?$")
+
+        count, period = limit.split("/", 1)
+        self.capacity = int(count)
+        self.rate = self.capacity / PERIODS[period.strip().rstrip("s")]
+
+    def matches(self, method: str, path: str) -> bool:
+        return method == self.method and self.path.match(path) is not None
+
+
+def _client_ip(scope: Scope, proxy_hops: int) -> str:
+    """
+    The socket peer, or — behind `proxy_hops` trusted proxies — the address the outermost
+    of them saw. Each proxy appends its peer to X-Forwarded-For, so that is the entry
+    `proxy_hops` from the right; anything further left was sent by the client.
+    """
+    if proxy_hops > 0:
+        forwarded = [
+            ip.strip()
+            for name, value in scope["headers"] if name == b"x-forwarded-for"
+            for ip in value.decode("latin-1").split(",") if ip.strip()
+        ]
+        if forwarded:
+            return forwarded[-proxy_hops] if len(forwarded) >= proxy_hops else forwarded[0]
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _client_key(scope: Scope, proxy_hops: int = 0) -> str:
+    """Authenticated callers are limited per user, everyone else per client IP."""
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer":
+                payload = decode_token(token)
+                if payload and payload.get("sub"):
+                    return f"user:{payload['sub']}"
+            break
+    return f"ip:{_client_ip(scope, proxy_hops)}"
+
+
+# ── Middleware ─────────────────────────────────────────
+
+class RateLimitMiddleware:
+    def __init__(self, app: ASGIApp, limits: dict[str, str], store, trusted_proxy_hops: int = 0):
+        self.app = app
+        self.rules = [RateLimitRule(route, limit) for route, limit in limits.items()]
+        self.store = store
+        self.trusted_proxy_hops = trusted_proxy_hops
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            rule = next((r for r in self.rules if r.matches(scope["method"], scope["path"])), None)
+            if rule is not None:
+                key = f"{rule.name}|{_client_key(scope, self.trusted_proxy_hops)}"
+                try:
+                    retry_after = await self.store.take(key, rule.capacity, rule.rate)
+                except Exception:
+                    # Fail open — a broken limiter store must not take the API down with it
+                    logger.exception("rate limit store error", extra={"route": rule.name})
+                    retry_after = 0
+                if retry_after > 0:
+                    REQUESTS_REJECTED.labels(reason="rate_limited", route=rule.route).inc()
+                    response = JSONResponse(
+                        {"detail": "Too many requests — please slow down"},
+                        status_code=429,
+                        headers={"Retry-After": str(math.ceil(retry_after))},
+                    )
+                    await response(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
+
+
+class ConcurrencyLimitMiddleware:
+    """Reject with 503 once `max_concurrent` requests are in flight in this process."""
+
+    def __init__(self, app: ASGIApp, max_concurrent: int, exempt_paths: tuple = ("/", "/health"), routes=()):
+        self.app = app
+        self.max_concurrent = max_concurrent
+        self.exempt_paths = exempt_paths
+        self.routes = routes  # only to label the rejections
+        self.in_flight = 0  # only touched from the event loop, so no lock needed
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
+
+        if self.in_flight >= self.max_concurrent:
+            REQUESTS_REJECTED.labels(reason="overloaded", route=route_template(self.routes, scope)).inc()
+            response = JSONResponse(
+                {"detail": "Server is busy — please retry shortly"},
+                status_code=503,
+                headers={"Retry-After": "1"},
+            )
+            await response(scope, receive, send)
+            return
+
+        self.in_flight += 1
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.in_flight -= 1
@@ -1,24 +1,82 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import settings
-from app.db.database import Base, engine
+from app.core.compression import CompressionMiddleware
+from app.core.jobs import jobs_lock, run_as_leader
+from app.core.log import configure_logging
+from app.core.metrics import MetricsMiddleware, render_metrics
+from app.core.rate_limit import RateLimitMiddleware, ConcurrencyLimitMiddleware, get_rate_limit_store
+from app.db.database import Base, engine, sync_schema
 from app.api.routes import auth, reports, admin, engagement
+from app.services import trending, idempotency, archive
 
 # Import all models so SQLAlchemy creates their tables
-from app.models import user, report, engagement as engagement_models  # noqa
+from app.models import user, report, engagement as engagement_models, analytics as analytics_models, idempotency as idempotency_models, archive as archive_models  # noqa
+
+configure_logging()
 
 # Create all tables on startup
 Base.metadata.create_all(bind=engine)
+sync_schema()
+
+
+# ── Background jobs ────────────────────────────────────
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Periodic background jobs — only the worker holding the jobs lock runs them
+    jobs = [trending.decay_loop, idempotency.purge_loop]
+    if settings.ARCHIVE_ENABLED:
+        jobs.append(archive.archive_loop)
+    tasks = [asyncio.create_task(run_as_leader(job)) for job in jobs]
+    yield
+    for task in tasks:
+        task.cancel()
+    jobs_lock.release()
+
 
 app = FastAPI(
     title="CivicTide API",
     description="Backend API for CivicTide — A Community Issue Reporting & Tracking Platform by TechTide Stratum",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan,
+)
+
+# ── Compression ────────────────────────────────────────
+# Innermost, so the request latency metrics include the time spent compressing
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+)
+
+# ── Admission control ──────────────────────────────────
+# Added before CORS so that 429/503 responses still carry CORS headers
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(
+        RateLimitMiddleware,
+        limits=settings.RATE_LIMITS,
+        store=get_rate_limit_store(settings.RATE_LIMIT_STORAGE_URL),
+        trusted_proxy_hops=settings.TRUSTED_PROXY_HOPS,
+    )
+app.add_middleware(
+    ConcurrencyLimitMiddleware,
+    max_concurrent=settings.MAX_CONCURRENT_REQUESTS,
+    exempt_paths=("/", "/health", "/metrics"),
+    routes=app.router.routes,
 )
 
+# ── Metrics ────────────────────────────────────────────
+# Outside admission control so shed requests are still counted
+# Given the route list (filled in by include_router below) to label requests that never reach routing
+app.add_middleware(MetricsMiddleware, routes=app.router.routes)
+
 # ── CORS ───────────────────────────────────────────────
 app.add_middleware(
     CORSMiddleware,
@@ -31,6 +89,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
 )
 
 # ── Routers ────────────────────────────────────────────
@@ -54,4 +113,11 @@ def root():
 
 @app.get("/health", tags=["Health"])
 def health():
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Prometheus scrape endpoint."""
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
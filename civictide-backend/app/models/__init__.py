@@ -1,3 +1,6 @@
 from app.models.user import User
 from app.models.report import Report
 from app.models.engagement import Vote, Comment
+from app.models.analytics import ReportStatusHistory, DailyCategoryRollup, DailyStatusRollup, DailyResolutionRollup
+from app.models.idempotency import IdempotencyKey
+from app.models.archive import ArchivedReport, ArchivedVote, ArchivedComment, ArchivedStatusHistory
@@ -0,0 +1,57 @@
+from sqlalchemy import Column, Integer, Date, DateTime, Enum, ForeignKey, UniqueConstraint
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+from app.models.report import ReportStatus, ReportCategory
+
+
+class ReportStatusHistory(Base):
+    """One row per status transition — the raw source the rollups are rebuilt from."""
+    __tablename__ = "report_status_history"
+
+    id = Column(Integer, primary_key=True, index=True)
+    report_id = Column(Integer, ForeignKey("reports.id"), nullable=False, index=True)
+    from_status = Column(Enum(ReportStatus), nullable=True)  # NULL for the initial "reported" entry
+    to_status = Column(Enum(ReportStatus), nullable=False)
+    changed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    # AUTOINCREMENT on SQLite: ids of archived history rows are never reused
+    __table_args__ = {"sqlite_autoincrement": True}
+
+
+class DailyCategoryRollup(Base):
+    """Reports created per day per category."""
+    __tablename__ = "rollup_daily_category"
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)
+    category = Column(Enum(ReportCategory), nullable=False)
+    created = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (UniqueConstraint("day", "category", name="unique_rollup_day_category"),)
+
+
+class DailyStatusRollup(Base):
+    """Reports entering / leaving each status per day — the running sum is the backlog."""
+    __tablename__ = "rollup_daily_status"
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)
+    status = Column(Enum(ReportStatus), nullable=False)
+    entered = Column(Integer, nullable=False, default=0)
+    exited = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (UniqueConstraint("day", "status", name="unique_rollup_day_status"),)
+
+
+class DailyResolutionRollup(Base):
+    """Histogram of time-to-resolution per day, bucketed by app.services.analytics.RESOLUTION_BUCKETS_HOURS."""
+    __tablename__ = "rollup_daily_resolution"
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)
+    bucket = Column(Integer, nullable=False)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (UniqueConstraint("day", "bucket", name="unique_rollup_day_bucket"),)
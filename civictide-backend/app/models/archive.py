@@ -0,0 +1,73 @@
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime, Enum, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+
+from app.db.database import Base
+from app.models.report import ReportStatus, ReportCategory
+
+
+class ArchivedReport(Base):
+    """
+    A resolved or rejected report moved out of `reports` by app.services.archive.
+    Rows keep their original id, so GET /api/reports/{id} can fall back to this table.
+    That needs ids that are never reused: Postgres sequences don't, and on SQLite the
+    hot tables are declared AUTOINCREMENT. Plain rowid tables hand the highest id out
+    again once it is deleted, so SQLite files created before that need recreating.
+    """
+    __tablename__ = "archived_reports"
+    # "My reports" pages over these alongside the hot table
+    __table_args__ = (Index("ix_archived_reports_user_id_created_at", "user_id", "created_at"),)
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(String(200), nullable=False)
+    description = Column(Text, nullable=False)
+    category = Column(Enum(ReportCategory), nullable=False)
+    status = Column(Enum(ReportStatus), nullable=False)
+
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
+    address = Column(String(300), nullable=True)
+
+    image_url = Column(String(500), nullable=True)
+    image_public_id = Column(String(200), nullable=True)
+
+    resolution_notes = Column(Text, nullable=True)
+
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    author = relationship("User")
+
+
+class ArchivedVote(Base):
+    __tablename__ = "archived_votes"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    report_id = Column(Integer, ForeignKey("archived_reports.id"), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True))
+
+
+class ArchivedComment(Base):
+    __tablename__ = "archived_comments"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    content = Column(Text, nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    report_id = Column(Integer, ForeignKey("archived_reports.id"), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True))
+
+
+class ArchivedStatusHistory(Base):
+    """Status transitions of archived reports — kept so analytics rebuilds still count them."""
+    __tablename__ = "archived_report_status_history"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    report_id = Column(Integer, ForeignKey("archived_reports.id"), nullable=False, index=True)
+    from_status = Column(Enum(ReportStatus), nullable=True)
+    to_status = Column(Enum(ReportStatus), nullable=False)
+    changed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    changed_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, Text, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, Text, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -9,11 +9,12 @@ class Vote(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
-    report_id = Column(Integer, ForeignKey("reports.id"), nullable=False)
+    report_id = Column(Integer, ForeignKey("reports.id"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    # One vote per user per report
-    __table_args__ = (UniqueConstraint("user_id", "report_id", name="unique_vote"),)
+    # One vote per user per report (also serves lookups by user_id)
+    # AUTOINCREMENT on SQLite: ids of archived votes are never reused
+    __table_args__ = (UniqueConstraint("user_id", "report_id", name="unique_vote"), {"sqlite_autoincrement": True})
 
     user = relationship("User")
     report = relationship("Report")
@@ -24,9 +25,14 @@ class Comment(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     content = Column(Text, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     report_id = Column(Integer, ForeignKey("reports.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    # Thread pages are keyset scans over (report_id, created_at, id); also serves the report_id FK
+    # AUTOINCREMENT on SQLite: ids of archived comments are never reused
+    __table_args__ = (Index("ix_comments_report_id_created_at", "report_id", "created_at", "id"),
+                      {"sqlite_autoincrement": True})
+
     user = relationship("User")
     report = relationship("Report")
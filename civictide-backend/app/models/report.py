@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime, Enum
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -53,8 +53,22 @@ class Report(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    # Trending — time-decayed engagement, maintained by app.services.trending
+    trending_score = Column(Float, nullable=False, default=0, server_default="0")
+    trending_updated_at = Column(DateTime(timezone=True), nullable=True)
+
     # Relationships
     author = relationship("User", back_populates="reports")
 
+    __table_args__ = (
+        # sort=trending is an ordered scan of this index
+        Index("ix_reports_trending_score", "trending_score", "id"),
+        # "My reports": page by (user_id, created_at); status is carried along on Postgres
+        # so the per-status counts are an index-only scan. Also serves the user_id FK.
+        Index("ix_reports_user_id_created_at", "user_id", "created_at", postgresql_include=["status"]),
+        # Archived rows keep their id, so SQLite must never hand it out again (see app.models.archive)
+        {"sqlite_autoincrement": True},
+    )
+
     def __repr__(self):
         return f"<Report id={self.id} title={self.title} status={self.status}>"
@@ -45,3 +45,8 @@ class ReportOut(BaseModel):
 class ReportListOut(BaseModel):
     total: int
     reports: list[ReportOut]
+
+
+class MyReportListOut(ReportListOut):
+    """A page of the current user's reports, with counts over all of them."""
+    by_status: dict[ReportStatus, int]
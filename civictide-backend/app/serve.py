@@ -0,0 +1,111 @@
+"""
+Production entry point — several preforked Uvicorn workers under Gunicorn:
+
+    python -m app.serve
+
+The app is imported once in the parent before forking, so settings parsing,
+create_all/sync_schema and cloudinary.config run once instead of per worker.
+Each worker's DB pool is sized so that all workers together stay under
+DB_MAX_CONNECTIONS. On SIGTERM the master stops accepting connections and gives
+in-flight requests GRACEFUL_TIMEOUT seconds to finish.
+
+For local development keep using `uvicorn app.main:app --reload`.
+"""
+import glob
+import logging
+import os
+import shutil
+import tempfile
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def worker_count() -> int:
+    return settings.WEB_CONCURRENCY or os.cpu_count() or 1
+
+
+def pool_sizes(workers: int) -> tuple[int, int, int]:
+    """
+    Split the Postgres connection budget between workers.
+    Returns (workers, pool_size, max_overflow) — workers shrinks if the budget can't
+    give each at least two connections.
+    """
+    budget = settings.DB_MAX_CONNECTIONS - settings.DB_RESERVED_CONNECTIONS
+    if budget // workers < 2:
+        workers = max(1, budget // 2)
+    # Never more than a single-process deployment would use — extra connections just idle
+    per_worker = min(budget // workers, settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+    pool_size = min(settings.DB_POOL_SIZE, per_worker)
+    return workers, pool_size, per_worker - pool_size
+
+
+def main():
+    from gunicorn.app.base import BaseApplication
+
+    requested = worker_count()
+    workers, pool_size, max_overflow = pool_sizes(requested)
+
+    # Both are read at import time below: the pool by app.db.database, the metrics
+    # directory by prometheus_client — so set them before importing the app.
+    settings.DB_POOL_SIZE = pool_size
+    settings.DB_MAX_OVERFLOW = max_overflow
+    metrics_dir = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    own_metrics_dir = not metrics_dir
+    if own_metrics_dir:
+        metrics_dir = os.environ["PROMETHEUS_MULTIPROC_DIR"] = tempfile.mkdtemp(prefix="civictide-metrics-")
+    else:
+        # The operator's directory — only clear the previous run's metric files
+        os.makedirs(metrics_dir, exist_ok=True)
+        for stale in glob.glob(os.path.join(metrics_dir, "*.db")):
+            os.remove(stale)
+
+    from app.main import app
+    from app.db.database import engine
+    from app.core.metrics import mark_worker_dead
+
+    # Startup work is done; don't let the workers inherit the parent's sockets
+    engine.dispose()
+
+    if workers != requested:
+        logger.warning("reduced workers to fit DB_MAX_CONNECTIONS", extra={"requested": requested, "workers": workers})
+    if workers > 1 and settings.RATE_LIMIT_ENABLED and settings.RATE_LIMIT_STORAGE_URL.startswith("memory://"):
+        logger.warning("in-memory rate limits are per worker — set RATE_LIMIT_STORAGE_URL to share them")
+    logger.info("starting server", extra={
+        "workers": workers, "db_pool_size": pool_size, "db_max_overflow": max_overflow,
+        "db_connections_max": workers * (pool_size + max_overflow),
+    })
+
+    def post_fork(server, worker):
+        engine.dispose(close=False)  # belt and braces — never share a pooled connection across processes
+
+    def child_exit(server, worker):
+        mark_worker_dead(worker.pid)
+
+    class Server(BaseApplication):
+        def load_config(self):
+            for key, value in {
+                "bind": f"{settings.HOST}:{settings.PORT}",
+                "workers": workers,
+                "worker_class": "uvicorn.workers.UvicornWorker",
+                "graceful_timeout": settings.GRACEFUL_TIMEOUT,
+                "timeout": settings.GRACEFUL_TIMEOUT + 30,
+                "keepalive": 5,
+                "post_fork": post_fork,
+                "child_exit": child_exit,
+            }.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    try:
+        Server().run()
+    finally:
+        if own_metrics_dir:
+            shutil.rmtree(metrics_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Incremental analytics rollups for the admin dashboard.
+
+The create / status-change / delete paths in app/api/routes/reports.py call the
+record_* helpers inside their own transaction, so the rollup tables always agree
+with `reports` + `report_status_history`. The timeseries endpoint reads only the
+rollups, never the hot `reports` table.
+
+If the rollups ever drift (manual SQL, a bucket change, an old database) rebuild them:
+
+    python -m app.services.analytics rebuild
+"""
+import argparse
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models.analytics import (
+    ReportStatusHistory, DailyCategoryRollup, DailyStatusRollup, DailyResolutionRollup
+)
+from app.models.archive import ArchivedReport, ArchivedStatusHistory
+from app.models.report import Report, ReportStatus, ReportCategory
+
+# Upper bounds (hours) of the time-to-resolution histogram. Anything slower lands in
+# the overflow bucket len(RESOLUTION_BUCKETS_HOURS). Changing these needs a rebuild.
+RESOLUTION_BUCKETS_HOURS = [1, 4, 12, 24, 48, 72, 168, 336, 720, 2160]
+
+
+# ── Helpers ────────────────────────────────────────────
+
+def _utc(ts: datetime) -> datetime:
+    # SQLite hands back naive datetimes; everything we store is UTC
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def _day(ts: datetime) -> date:
+    return _utc(ts).date()
+
+
+def _resolution_bucket(created_at: datetime, resolved_at: datetime) -> int:
+    hours = (_utc(resolved_at) - _utc(created_at)).total_seconds() / 3600
+    for i, upper in enumerate(RESOLUTION_BUCKETS_HOURS):
+        if hours <= upper:
+            return i
+    return len(RESOLUTION_BUCKETS_HOURS)
+
+
+def _bump(db: Session, model, keys: dict, **deltas):
+    """Atomically add `deltas` to the rollup row identified by `keys`, creating it if needed."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        row = db.query(model).filter_by(**keys).with_for_update().first()
+        if row is None:
+            db.add(model(**keys, **deltas))
+        else:
+            for column, delta in deltas.items():
+                setattr(row, column, getattr(row, column) + delta)
+        db.flush()
+        return
+
+    stmt = insert(model).values(**keys, **deltas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(keys),
+        set_={column: getattr(model, column) + stmt.excluded[column] for column in deltas},
+    )
+    db.execute(stmt)
+
+
+# ── Incremental maintenance ────────────────────────────
+
+def record_report_created(db: Session, report: Report):
+    """Call after the new report has been flushed (so created_at is populated)."""
+    db.add(ReportStatusHistory(
+        report_id=report.id,
+        from_status=None,
+        to_status=report.status,
+        changed_by=report.user_id,
+        changed_at=report.created_at,
+    ))
+    day = _day(report.created_at)
+    _bump(db, DailyCategoryRollup, {"day": day, "category": report.category}, created=1)
+    _bump(db, DailyStatusRollup, {"day": day, "status": report.status}, entered=1, exited=0)
+
+
+def record_status_change(db: Session, report: Report, old_status: ReportStatus, changed_by: int = None):
+    """Call after report.status has been set to its new value, before commit."""
+    new_status = report.status
+    if old_status == new_status:
+        return
+
+    now = datetime.now(timezone.utc)
+    db.add(ReportStatusHistory(
+        report_id=report.id,
+        from_status=old_status,
+        to_status=new_status,
+        changed_by=changed_by,
+        changed_at=now,
+    ))
+    day = now.date()
+    _bump(db, DailyStatusRollup, {"day": day, "status": old_status}, entered=0, exited=1)
+    _bump(db, DailyStatusRollup, {"day": day, "status": new_status}, entered=1, exited=0)
+    if new_status == ReportStatus.RESOLVED:
+        bucket = _resolution_bucket(report.created_at, now)
+        _bump(db, DailyResolutionRollup, {"day": day, "bucket": bucket}, count=1)
+
+
+def record_report_deleted(db: Session, report: Report):
+    """
+    Back the report's contributions out of every rollup and drop its history, so a
+    deleted report disappears from the series exactly as a rebuild would leave it.
+    """
+    history = (
+        db.query(ReportStatusHistory)
+        .filter(ReportStatusHistory.report_id == report.id)
+        .all()
+    )
+    _bump(db, DailyCategoryRollup, {"day": _day(report.created_at), "category": report.category}, created=-1)
+    for h in history:
+        day = _day(h.changed_at)
+        _bump(db, DailyStatusRollup, {"day": day, "status": h.to_status}, entered=-1, exited=0)
+        if h.from_status is not None:
+            _bump(db, DailyStatusRollup, {"day": day, "status": h.from_status}, entered=0, exited=-1)
+        if h.to_status == ReportStatus.RESOLVED:
+            bucket = _resolution_bucket(report.created_at, h.changed_at)
+            _bump(db, DailyResolutionRollup, {"day": day, "bucket": bucket}, count=-1)
+
+    db.query(ReportStatusHistory).filter(ReportStatusHistory.report_id == report.id).delete()
+
+
+# ── Rebuild ────────────────────────────────────────────
+
+def _backfill_history(db: Session) -> int:
+    """Give reports filed before status history existed a best-effort history."""
+    has_history = select(ReportStatusHistory.report_id).distinct()
+    missing = db.query(Report).filter(Report.id.notin_(has_history)).all()
+
+    added = 0
+    for r in missing:
+        db.add(ReportStatusHistory(
+            report_id=r.id, from_status=None, to_status=ReportStatus.REPORTED,
+            changed_by=r.user_id, changed_at=r.created_at,
+        ))
+        if r.status != ReportStatus.REPORTED:
+            db.add(ReportStatusHistory(
+                report_id=r.id, from_status=ReportStatus.REPORTED, to_status=r.status,
+                changed_at=r.updated_at or r.created_at,
+            ))
+        added += 1
+    db.flush()
+    return added
+
+
+def rebuild_rollups(db: Session) -> dict:
+    """Recompute every rollup table from the reports and status history, hot and archived."""
+    backfilled = _backfill_history(db)
+
+    # Archived reports keep counting — app.services.archive only moves them
+    created = Counter()
+    report_created_at = {}
+    for model in (Report, ArchivedReport):
+        for report_id, category, created_at in db.query(model.id, model.category, model.created_at).yield_per(5000):
+            created[(_day(created_at), category)] += 1
+            report_created_at[report_id] = created_at
+
+    flows = defaultdict(lambda: [0, 0])
+    resolutions = Counter()
+    for model in (ReportStatusHistory, ArchivedStatusHistory):
+        history = db.query(model.report_id, model.from_status, model.to_status, model.changed_at).yield_per(5000)
+        for report_id, from_status, to_status, changed_at in history:
+            day = _day(changed_at)
+            flows[(day, to_status)][0] += 1
+            if from_status is not None:
+                flows[(day, from_status)][1] += 1
+            if to_status == ReportStatus.RESOLVED and report_id in report_created_at:
+                resolutions[(day, _resolution_bucket(report_created_at[report_id], changed_at))] += 1
+
+    db.query(DailyCategoryRollup).delete()
+    db.query(DailyStatusRollup).delete()
+    db.query(DailyResolutionRollup).delete()
+    db.bulk_insert_mappings(DailyCategoryRollup, [
+        {"day": day, "category": category, "created": n} for (day, category), n in created.items()
+    ])
+    db.bulk_insert_mappings(DailyStatusRollup, [
+        {"day": day, "status": status, "entered": e, "exited": x} for (day, status), (e, x) in flows.items()
+    ])
+    db.bulk_insert_mappings(DailyResolutionRollup, [
+        {"day": day, "bucket": bucket, "count": n} for (day, bucket), n in resolutions.items()
+    ])
+    db.commit()
+
+    return {
+        "history_backfilled": backfilled,
+        "category_rows": len(created),
+        "status_rows": len(flows),
+        "resolution_rows": len(resolutions),
+    }
+
+
+# ── Reads ──────────────────────────────────────────────
+
+def _median_hours(buckets: Counter):
+    """Median time-to-resolution, interpolated linearly inside the histogram bucket."""
+    total = sum(buckets.values())
+    if total <= 0:
+        return None
+    half = total / 2
+    seen = 0
+    for i in range(len(RESOLUTION_BUCKETS_HOURS) + 1):
+        n = buckets.get(i, 0)
+        if n > 0 and seen + n >= half:
+            lower = RESOLUTION_BUCKETS_HOURS[i - 1] if i > 0 else 0
+            if i == len(RESOLUTION_BUCKETS_HOURS):
+                return float(lower)
+            upper = RESOLUTION_BUCKETS_HOURS[i]
+            return round(lower + (upper - lower) * (half - seen) / n, 1)
+        seen += n
+    return None
+
+
+def get_timeseries(db: Session, granularity: str = "day", periods: int = 30) -> dict:
+    """Per-period trends read exclusively from the rollup tables."""
+    today = datetime.now(timezone.utc).date()
+    if granularity == "week":
+        step = timedelta(weeks=1)
+        current = today - timedelta(days=today.weekday())
+    else:
+        step = timedelta(days=1)
+        current = today
+    starts = [current - step * i for i in reversed(range(periods))]
+    first = starts[0]
+
+    def period_of(day: date) -> date:
+        return day - timedelta(days=day.weekday()) if granularity == "week" else day
+
+    created = defaultdict(Counter)
+    for day, category, n in (
+        db.query(DailyCategoryRollup.day, DailyCategoryRollup.category, DailyCategoryRollup.created)
+        .filter(DailyCategoryRollup.day >= first)
+    ):
+        created[period_of(day)][category.value] += n
+
+    resolutions = defaultdict(Counter)
+    for day, bucket, n in (
+        db.query(DailyResolutionRollup.day, DailyResolutionRollup.bucket, DailyResolutionRollup.count)
+        .filter(DailyResolutionRollup.day >= first)
+    ):
+        resolutions[period_of(day)][bucket] += n
+
+    # Backlog is a running total, so start from everything that happened before the window
+    backlog = Counter()
+    flows = defaultdict(Counter)
+    for day, status, entered, exited in db.query(
+        DailyStatusRollup.day, DailyStatusRollup.status, DailyStatusRollup.entered, DailyStatusRollup.exited
+    ):
+        if day < first:
+            backlog[status.value] += entered - exited
+        else:
+            flows[period_of(day)][status.value] += entered - exited
+
+    series = []
+    for start in starts:
+        backlog.update(flows[start])
+        series.append({
+            "period": start.isoformat(),
+            "created": sum(created[start].values()),
+            "created_by_category": {c.value: created[start].get(c.value, 0) for c in ReportCategory},
+            "resolved": sum(resolutions[start].values()),
+            "median_resolution_hours": _median_hours(resolutions[start]),
+            "backlog": {s.value: backlog.get(s.value, 0) for s in ReportStatus},
+        })
+
+    return {"granularity": granularity, "from": first.isoformat(), "to": today.isoformat(), "series": series}
+
+
+# ── CLI ────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CivicTide analytics rollups")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.parse_args()
+
+    from app.db.database import Base, SessionLocal, engine, sync_schema
+    import app.models  # noqa — register every table
+
+    Base.metadata.create_all(bind=engine)
+    sync_schema()
+    db = SessionLocal()
+    try:
+        print(rebuild_rollups(db))
+    finally:
+        db.close()
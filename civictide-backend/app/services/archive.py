@@ -0,0 +1,182 @@
+"""
+Data retention for resolved and rejected reports.
+
+Reports that have been closed and untouched for ARCHIVE_AFTER_DAYS are moved, with
+their votes, comments and status history, from the hot tables into archived_*. That
+keeps `reports`, `votes` and `comments` — and their indexes — proportional to the
+open workload. Archived reports keep their id and are still served by
+GET /api/reports/{id}, the engagement read endpoints and GET /api/reports/my/reports.
+
+Each batch is copied with INSERT … SELECT and deleted from the hot tables in a single
+transaction. A crash leaves nothing half-moved, and the next run picks up whatever is
+still eligible, so the job needs no checkpoint to resume. On Postgres the batch is
+selected FOR UPDATE SKIP LOCKED, so workers running the loop at the same time never
+claim the same reports. The job sleeps ARCHIVE_BATCH_PAUSE_SECONDS between batches.
+
+The rollups are not touched: archived reports still count in the dashboard trends,
+and analytics.rebuild_rollups reads the archive tables too.
+
+    python -m app.services.archive run [--older-than-days N] [--max-batches N]
+    python -m app.services.archive status
+"""
+import argparse
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import ARCHIVE_ROWS, ARCHIVE_BATCH_DURATION, ARCHIVE_PENDING, ARCHIVE_LAST_SUCCESS, timed
+from app.models.analytics import ReportStatusHistory
+from app.models.archive import ArchivedReport, ArchivedVote, ArchivedComment, ArchivedStatusHistory
+from app.models.engagement import Vote, Comment
+from app.models.report import Report, ReportStatus
+from app.services.cache import comment_first_pages
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATUSES = (ReportStatus.RESOLVED, ReportStatus.REJECTED)
+
+# (hot model, archive model), parents first — copied in this order, deleted in reverse
+MOVES = (
+    (Report, ArchivedReport),
+    (ReportStatusHistory, ArchivedStatusHistory),
+    (Vote, ArchivedVote),
+    (Comment, ArchivedComment),
+)
+
+
+def cutoff_for(days: int) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(days=days)
+
+
+def eligible(db: Session, cutoff: datetime):
+    """Closed reports whose last change is older than `cutoff`."""
+    last_changed = func.coalesce(Report.updated_at, Report.created_at)
+    return db.query(Report.id).filter(Report.status.in_(CLOSED_STATUSES), last_changed < cutoff)
+
+
+def pending_count(db: Session, cutoff: datetime) -> int:
+    return eligible(db, cutoff).count()
+
+
+def _report_key(model):
+    return model.id if model is Report else model.report_id
+
+
+def archive_batch(db: Session, cutoff: datetime, batch_size: int) -> dict[str, int]:
+    """Move up to `batch_size` eligible reports and everything hanging off them. Returns rows moved per table."""
+    query = eligible(db, cutoff).order_by(Report.id).limit(batch_size)
+    if db.bind.dialect.name == "postgresql":
+        query = query.with_for_update(skip_locked=True)
+    ids = [report_id for report_id, in query]
+    if not ids:
+        db.rollback()
+        return {}
+
+    moved = {}
+    for hot, archived in MOVES:
+        source = hot.__table__
+        columns = [c.name for c in archived.__table__.columns if c.name in source.c]
+        stmt = insert(archived.__table__).from_select(
+            columns, select(*(source.c[name] for name in columns)).where(_report_key(hot).in_(ids))
+        )
+        moved[source.name] = db.execute(stmt).rowcount
+    for hot, _ in reversed(MOVES):
+        db.query(hot).filter(_report_key(hot).in_(ids)).delete(synchronize_session=False)
+    db.commit()
+
+    # The threads now come from archived_comments — don't keep serving the hot copy
+    for report_id in ids:
+        comment_first_pages.pop(report_id)
+    for table, rows in moved.items():
+        ARCHIVE_ROWS.labels(table=table).inc(rows)
+    return moved
+
+
+def archive_all(db: Session, days: Optional[int] = None, max_batches: Optional[int] = None) -> dict[str, int]:
+    """
+    Archive everything eligible, batch by batch, pausing between batches. The cutoff is
+    fixed at the start so the run terminates even while reports keep closing.
+    """
+    cutoff = cutoff_for(settings.ARCHIVE_AFTER_DAYS if days is None else days)
+    pending = pending_count(db, cutoff)
+    ARCHIVE_PENDING.set(pending)
+
+    totals = Counter()
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with timed(ARCHIVE_BATCH_DURATION):
+            moved = archive_batch(db, cutoff, settings.ARCHIVE_BATCH_SIZE)
+        if not moved:
+            break
+        totals.update(moved)
+        batches += 1
+        pending = max(0, pending - moved[Report.__tablename__])
+        ARCHIVE_PENDING.set(pending)
+        logger.info("archive batch done", extra={"batch": batches, "reports": moved[Report.__tablename__],
+                                                   "pending": pending})
+        time.sleep(settings.ARCHIVE_BATCH_PAUSE_SECONDS)
+
+    ARCHIVE_LAST_SUCCESS.set_to_current_time()
+    return {"batches": batches, **totals}
+
+
+def status(db: Session) -> dict:
+    cutoff = cutoff_for(settings.ARCHIVE_AFTER_DAYS)
+    return {
+        "cutoff": cutoff.isoformat(),
+        "pending": pending_count(db, cutoff),
+        "archived_reports": db.query(func.count(ArchivedReport.id)).scalar(),
+        "hot_reports": db.query(func.count(Report.id)).scalar(),
+    }
+
+
+async def archive_loop():
+    """Background task started from app.main's lifespan when ARCHIVE_ENABLED."""
+    from app.db.database import SessionLocal
+
+    def run_once():
+        db = SessionLocal()
+        try:
+            return archive_all(db)
+        finally:
+            db.close()
+
+    while True:
+        await asyncio.sleep(settings.ARCHIVE_INTERVAL_SECONDS)
+        try:
+            result = await run_in_threadpool(run_once)
+            logger.info("archive run finished", extra=result)
+        except Exception:
+            logger.exception("archive run failed")
+
+
+# ── CLI ────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CivicTide report archival")
+    parser.add_argument("command", choices=["run", "status"])
+    parser.add_argument("--older-than-days", type=int, default=None, help="default: ARCHIVE_AFTER_DAYS")
+    parser.add_argument("--max-batches", type=int, default=None, help="stop after this many batches")
+    args = parser.parse_args()
+
+    from app.db.database import Base, SessionLocal, engine, sync_schema
+    import app.models  # noqa — register every table
+
+    Base.metadata.create_all(bind=engine)
+    sync_schema()
+    db = SessionLocal()
+    try:
+        if args.command == "run":
+            print(archive_all(db, days=args.older_than_days, max_batches=args.max_batches))
+        else:
+            print(status(db))
+    finally:
+        db.close()
@@ -0,0 +1,79 @@
+import threading
+import time
+from collections import OrderedDict
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    Small thread-safe LRU cache whose entries also expire after `ttl` seconds.
+
+    Per process only — with several workers each keeps its own copy, so callers
+    must invalidate on writes and rely on the TTL to bound staleness elsewhere.
+
+    A reader that fills the cache after a slow query should take version(key)
+    before the query and pass it to set(): if the key was invalidated meanwhile,
+    the stale value is dropped instead of being cached for the full TTL.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 30):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        # key -> generation of its last invalidation. Forgotten keys report _floor,
+        # which is at least as new as anything forgotten, so a reader never misses one.
+        self._versions: OrderedDict = OrderedDict()
+        self._generation = 0
+        self._floor = 0
+
+    def _invalidate(self, key):
+        self._generation += 1
+        self._versions[key] = self._generation
+        self._versions.move_to_end(key)
+        while len(self._versions) > self.maxsize:
+            _, forgotten = self._versions.popitem(last=False)
+            self._floor = max(self._floor, forgotten)
+
+    def version(self, key) -> int:
+        with self._lock:
+            return self._versions.get(key, self._floor)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, version: int = None):
+        with self._lock:
+            if version is not None and self._versions.get(key, self._floor) != version:
+                return  # invalidated while the value was being computed
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+            self._invalidate(key)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._versions.clear()
+            self._generation += 1
+            self._floor = self._generation
+
+
+# report_id -> {(order, limit): (comments, next_cursor)} for the first page of each thread.
+# Popped on comment writes, report deletion and archival.
+comment_first_pages = TTLCache(maxsize=settings.COMMENT_CACHE_SIZE, ttl=settings.COMMENT_CACHE_TTL_SECONDS)
@@ -1,13 +1,20 @@
+import logging
 import smtplib
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.core.config import settings
+from app.core.metrics import EMAIL_DURATION
+
+logger = logging.getLogger(__name__)
 
 
 def send_email(to: str, subject: str, html_body: str):
     """Send an HTML email via Gmail SMTP using SSL on port 465."""
+    start = time.perf_counter()
+    outcome = "error"
     try:
-        print(f"📧 Sending email to {to}...")
+        logger.info("sending email", extra={"to": to, "subject": subject})
 
         msg = MIMEMultipart("alternative")
         msg["Subject"] = subject
@@ -20,14 +27,17 @@ def send_email(to: str, subject: str, html_body: str):
             server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
             server.sendmail(settings.SMTP_USER, to, msg.as_string())
 
-        print(f"✅ Email sent successfully to {to}")
+        outcome = "ok"
+        logger.info("email sent", extra={"to": to})
 
     except smtplib.SMTPAuthenticationError as e:
-        print(f"❌ Authentication failed — check Gmail App Password: {e}")
+        logger.error("email authentication failed — check Gmail App Password", extra={"to": to, "error": str(e)})
     except smtplib.SMTPException as e:
-        print(f"❌ SMTP error: {e}")
+        logger.error("smtp error", extra={"to": to, "error": str(e)})
     except Exception as e:
-        print(f"❌ Email failed: {type(e).__name__}: {e}")
+        logger.error("email failed", extra={"to": to, "error": f"{type(e).__name__}: {e}"})
+    finally:
+        EMAIL_DURATION.labels(outcome=outcome).observe(time.perf_counter() - start)
 
 
 def send_status_update_email(to: str, name: str, report_title: str, new_status: str, resolution_notes: str = None):
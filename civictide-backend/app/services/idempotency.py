@@ -0,0 +1,154 @@
+"""
+Idempotency-Key support for POST endpoints that citizens retry on flaky connections.
+
+The first request with a key inserts an in-flight row (the unique constraint makes
+that the lock). The route stores its response on that row in the same transaction
+as its own writes, so either both land or neither does. A retry then gets the stored
+response back without redoing uploads, inserts or emails. A duplicate that arrives
+while the first attempt is still running polls until the result is stored, for up to
+IDEMPOTENCY_WAIT_SECONDS.
+
+Keys live in the database, so they work across every worker.
+
+    claim = idempotency.claim(db, key, current_user.id, "POST /reports", fingerprint(...))
+    if claim.replay:
+        return claim.replay
+    try:
+        ...
+        claim.complete(201, data)
+        db.commit()
+    except Exception:
+        claim.release()
+        raise
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models.idempotency import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL = 0.1
+
+
+def fingerprint(*parts) -> str:
+    """Hash the request inputs, so a key reused for a different request is rejected."""
+    return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+
+def _utc(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+class Claim:
+    def __init__(self, db: Session, row: Optional[IdempotencyKey] = None, replay: Optional[JSONResponse] = None):
+        self.db = db
+        self.row = row
+        self.replay = replay
+
+    def complete(self, status_code: int, body: BaseModel):
+        """Store the response. Does not commit — call before the route's own commit."""
+        if self.row is None:
+            return
+        self.row.status_code = status_code
+        self.row.response_body = json.dumps(body.model_dump(mode="json"))
+        self.row.expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+
+    def release(self):
+        """The attempt failed — forget the key so the client can retry."""
+        if self.row is None:
+            return
+        self.db.rollback()
+        self.db.query(IdempotencyKey).filter(IdempotencyKey.id == self.row.id).delete()
+        self.db.commit()
+
+
+def claim(db: Session, key: Optional[str], user_id: int, endpoint: str, request_fingerprint: str) -> Claim:
+    """Claim `key` for this request, or return the stored response of an earlier attempt."""
+    if not key:
+        return Claim(db)
+
+    deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+    while True:
+        now = datetime.now(timezone.utc)
+        row = IdempotencyKey(
+            user_id=user_id,
+            endpoint=endpoint,
+            key=key,
+            fingerprint=request_fingerprint,
+            # An attempt that never completes (crashed worker) frees the key after this
+            expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_INFLIGHT_TIMEOUT_SECONDS),
+        )
+        db.add(row)
+        try:
+            db.commit()
+            return Claim(db, row=row)
+        except IntegrityError:
+            db.rollback()
+
+        existing = (
+            db.query(IdempotencyKey)
+            .filter_by(user_id=user_id, endpoint=endpoint, key=key)
+            .populate_existing()
+            .first()
+        )
+        if existing is None:
+            continue  # released in the meantime — try to claim it again
+        if _utc(existing.expires_at) < now:
+            db.delete(existing)
+            db.commit()
+            continue
+        if existing.fingerprint != request_fingerprint:
+            db.rollback()
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+        if existing.status_code is not None:
+            body = json.loads(existing.response_body)
+            status_code = existing.status_code
+            db.rollback()
+            return Claim(db, replay=JSONResponse(body, status_code=status_code, headers={"Idempotent-Replayed": "true"}))
+
+        db.rollback()  # end the read so the poll sees the first attempt's commit
+        if time.monotonic() > deadline:
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+        time.sleep(POLL_INTERVAL)
+
+
+def purge_expired(db: Session) -> int:
+    deleted = db.query(IdempotencyKey).filter(IdempotencyKey.expires_at < datetime.now(timezone.utc)).delete()
+    db.commit()
+    return deleted
+
+
+async def purge_loop():
+    """Background task started from app.main's lifespan."""
+    from app.db.database import SessionLocal
+
+    def run_once():
+        db = SessionLocal()
+        try:
+            return purge_expired(db)
+        finally:
+            db.close()
+
+    while True:
+        await asyncio.sleep(settings.IDEMPOTENCY_PURGE_INTERVAL_SECONDS)
+        try:
+            deleted = await run_in_threadpool(run_once)
+            logger.info("expired idempotency keys purged", extra={"rows": deleted})
+        except Exception:
+            logger.exception("idempotency purge failed")
@@ -0,0 +1,228 @@
+"""
+Trending scores for the `sort=trending` report feed.
+
+Each report stores its score as of `trending_updated_at`. Every engagement event
+decays the stored score to "now" and adds the event's weight in a single UPDATE, so
+    score = Σ weight · 2^(-age_hours / TRENDING_HALF_LIFE_HOURS)
+over the report's engagement, without counting votes or comments on read.
+
+Trending writes never touch `updated_at`: it is the report's user-visible "last
+updated" and the clock app.services.archive uses.
+
+Between events scores are only decayed by decay_loop(), which moves every row to
+the same reference time. Rows touched by an event since then are at most one
+interval "fresher" than the rest, which is fine for a ranking. Each pass rewrites
+every live report, so under app.serve the loop runs in one worker only (app.core.jobs).
+
+To recompute every score from votes and comments (e.g. after changing weights):
+
+    python -m app.services.trending rebuild
+"""
+import argparse
+import asyncio
+import logging
+import math
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, bindparam, case, extract, func, literal, update
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.models.engagement import Vote, Comment
+from app.models.report import Report
+
+logger = logging.getLogger(__name__)
+
+NEW_REPORT_WEIGHT = 1.0
+VOTE_WEIGHT = 1.0
+COMMENT_WEIGHT = 2.0
+MIN_SCORE = 1e-4  # below this a report has effectively stopped trending
+
+
+def _utc(ts: datetime) -> datetime:
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(timezone.utc)
+
+
+def decay(since: datetime, now: datetime) -> float:
+    if since is None:
+        return 1.0
+    hours = max(0.0, (now - _utc(since)).total_seconds() / 3600)
+    return math.pow(2, -hours / settings.TRENDING_HALF_LIFE_HOURS)
+
+
+def _decay_since_sql(db: Session, now: datetime):
+    """decay(trending_updated_at, now), evaluated on the row inside the UPDATE."""
+    since = Report.trending_updated_at
+    at = literal(now, DateTime(timezone=True))
+    if db.bind.dialect.name == "postgresql":
+        hours = func.greatest(extract("epoch", at - since) / 3600, 0)
+    else:
+        hours = func.max((func.julianday(at) - func.julianday(since)) * 24, 0)
+    return case((since.is_(None), 1.0), else_=func.power(2.0, -hours / settings.TRENDING_HALF_LIFE_HOURS))
+
+
+def _apply(db: Session, report_id: int, weight: float, event_at: datetime = None):
+    """
+    Decay the report's stored score to now and add `weight` (itself decayed from
+    `event_at`) in one UPDATE, so simultaneous events on a hot report all count.
+    """
+    now = datetime.now(timezone.utc)
+    table = Report.__table__
+    score = table.c.trending_score * _decay_since_sql(db, now) + weight * decay(event_at, now)
+    db.execute(
+        update(table)
+        .where(table.c.id == report_id)
+        .values(
+            trending_score=case((score > MIN_SCORE, score), else_=0),
+            trending_updated_at=now,
+            updated_at=table.c.updated_at,  # engagement is not an edit — keep "last updated" and the archive clock
+        )
+    )
+
+
+# ── Engagement events ──────────────────────────────────
+# Called before the route commits. The UPDATE holds the report's row lock until then.
+
+def record_new_report(report: Report):
+    """Called on the new, unsaved Report — the INSERT carries its starting score."""
+    report.trending_score = NEW_REPORT_WEIGHT
+    report.trending_updated_at = datetime.now(timezone.utc)
+
+
+def record_vote(db: Session, report_id: int):
+    _apply(db, report_id, VOTE_WEIGHT)
+
+
+def record_unvote(db: Session, report_id: int, vote: Vote):
+    _apply(db, report_id, -VOTE_WEIGHT, vote.created_at)
+
+
+def record_comment(db: Session, report_id: int):
+    _apply(db, report_id, COMMENT_WEIGHT)
+
+
+def record_uncomment(db: Session, report_id: int, comment: Comment):
+    _apply(db, report_id, -COMMENT_WEIGHT, comment.created_at)
+
+
+# ── Periodic decay ─────────────────────────────────────
+
+def redecay_all(db: Session, batch_size: int = 1000) -> int:
+    """Decay every live score to now, in id-ordered batches. Returns rows updated."""
+    table = Report.__table__
+    # Only overwrite rows no event has touched since we read them
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .where(table.c.trending_updated_at.is_not_distinct_from(bindparam("seen_at")))
+        .values(
+            trending_score=bindparam("new_score"),
+            trending_updated_at=bindparam("new_updated_at"),
+            updated_at=table.c.updated_at,  # don't let onupdate touch "last updated"
+        )
+    )
+
+    updated = 0
+    last_id = 0
+    while True:
+        rows = (
+            db.query(Report.id, Report.trending_score, Report.trending_updated_at)
+            .filter(Report.id > last_id, Report.trending_score > 0)
+            .order_by(Report.id)
+            .limit(batch_size)
+            .all()
+        )
+        if not rows:
+            break
+        now = datetime.now(timezone.utc)
+        params = []
+        for row_id, score, updated_at in rows:
+            score *= decay(updated_at, now)
+            params.append({
+                "row_id": row_id,
+                "seen_at": updated_at,
+                "new_score": score if score > MIN_SCORE else 0,
+                "new_updated_at": now,
+            })
+        db.execute(stmt, params)
+        db.commit()
+        updated += len(rows)
+        last_id = rows[-1][0]
+    return updated
+
+
+def rebuild_scores(db: Session) -> int:
+    """Recompute every score from scratch: new-report weight plus all votes and comments."""
+    now = datetime.now(timezone.utc)
+    scores = {
+        report_id: NEW_REPORT_WEIGHT * decay(created_at, now)
+        for report_id, created_at in db.query(Report.id, Report.created_at).yield_per(5000)
+    }
+    for report_id, created_at in db.query(Vote.report_id, Vote.created_at).yield_per(5000):
+        if report_id in scores:
+            scores[report_id] += VOTE_WEIGHT * decay(created_at, now)
+    for report_id, created_at in db.query(Comment.report_id, Comment.created_at).yield_per(5000):
+        if report_id in scores:
+            scores[report_id] += COMMENT_WEIGHT * decay(created_at, now)
+
+    table = Report.__table__
+    stmt = (
+        update(table)
+        .where(table.c.id == bindparam("row_id"))
+        .values(
+            trending_score=bindparam("new_score"),
+            trending_updated_at=bindparam("new_updated_at"),
+            updated_at=table.c.updated_at,  # don't let onupdate touch "last updated"
+        )
+    )
+    db.execute(stmt, [
+        {"row_id": report_id, "new_score": score if score > MIN_SCORE else 0, "new_updated_at": now}
+        for report_id, score in scores.items()
+    ])
+    db.commit()
+    return len(scores)
+
+
+async def decay_loop():
+    """Background task started from app.main's lifespan."""
+    from app.db.database import SessionLocal
+
+    def run_once():
+        db = SessionLocal()
+        try:
+            return redecay_all(db)
+        finally:
+            db.close()
+
+    while True:
+        await asyncio.sleep(settings.TRENDING_DECAY_INTERVAL_SECONDS)
+        try:
+            updated = await run_in_threadpool(run_once)
+            logger.info("trending scores decayed", extra={"rows": updated})
+        except Exception:
+            logger.exception("trending decay failed")
+
+
+# ── CLI ────────────────────────────────────────────────
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CivicTide trending scores")
+    parser.add_argument("command", choices=["rebuild", "decay"])
+    args = parser.parse_args()
+
+    from app.db.database import Base, SessionLocal, engine, sync_schema
+    import app.models  # noqa — register every table
+
+    Base.metadata.create_all(bind=engine)
+    sync_schema()
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            print({"reports_rescored": rebuild_scores(db)})
+        else:
+            print({"reports_decayed": redecay_all(db)})
+    finally:
+        db.close()
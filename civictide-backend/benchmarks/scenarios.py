@@ -0,0 +1,101 @@
+"""
+Benchmark scenarios. Each one issues a single request per call and returns the response;
+the runner in benchmarks/run.py drives them concurrently and collects timings.
+"""
+import random
+
+from app.models.report import ReportCategory, ReportStatus
+
+
+class Context:
+    """What scenarios need to know about the seeded data."""
+
+    def __init__(self, n: dict, user_tokens: list[str], admin_token: str, emails: list[str], password: str):
+        self.n = n
+        self.user_tokens = user_tokens
+        self.admin_token = admin_token
+        self.emails = emails
+        self.password = password
+        self.rng = random.Random(7)
+
+    def report_id(self) -> int:
+        return self.rng.randint(1, self.n["reports"])
+
+    def hot_report_id(self) -> int:
+        # The seeder concentrates engagement on the lowest ids
+        return self.rng.randint(1, min(20, self.n["reports"]))
+
+    def user_headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.rng.choice(self.user_tokens)}"}
+
+    def admin_headers(self) -> dict:
+        return {"Authorization": f"Bearer {self.admin_token}"}
+
+
+async def list_reports(client, ctx: Context):
+    skip = ctx.rng.randint(0, 20) * 50
+    return await client.get("/api/reports/", params={"skip": skip, "limit": 50})
+
+
+async def map_pins(client, ctx: Context):
+    # What the map view needs — a sparse projection of the same page
+    skip = ctx.rng.randint(0, 20) * 50
+    params = {"skip": skip, "limit": 50, "fields": "id,latitude,longitude,category,status"}
+    return await client.get("/api/reports/", params=params)
+
+
+async def list_filtered(client, ctx: Context):
+    params = {
+        "category": ctx.rng.choice(list(ReportCategory)).value,
+        "status": ctx.rng.choice(list(ReportStatus)).value,
+        "limit": 50,
+    }
+    return await client.get("/api/reports/", params=params)
+
+
+async def trending_feed(client, ctx: Context):
+    return await client.get("/api/reports/", params={"sort": "trending", "limit": 50})
+
+
+async def report_detail(client, ctx: Context):
+    return await client.get(f"/api/reports/{ctx.report_id()}")
+
+
+async def my_reports(client, ctx: Context):
+    return await client.get("/api/reports/my/reports", params={"limit": 20}, headers=ctx.user_headers())
+
+
+async def vote_toggle(client, ctx: Context):
+    return await client.post(f"/api/engagement/reports/{ctx.hot_report_id()}/vote", headers=ctx.user_headers())
+
+
+async def comment_thread(client, ctx: Context):
+    return await client.get(f"/api/engagement/reports/{ctx.hot_report_id()}/comments")
+
+
+async def admin_stats(client, ctx: Context):
+    return await client.get("/api/admin/stats", headers=ctx.admin_headers())
+
+
+async def admin_timeseries(client, ctx: Context):
+    return await client.get("/api/admin/stats/timeseries", params={"granularity": "week", "periods": 12},
+                            headers=ctx.admin_headers())
+
+
+async def login_burst(client, ctx: Context):
+    return await client.post("/api/auth/login", json={"email": ctx.rng.choice(ctx.emails), "password": ctx.password})
+
+
+SCENARIOS = {
+    "list_reports": list_reports,
+    "map_pins": map_pins,
+    "list_filtered": list_filtered,
+    "trending_feed": trending_feed,
+    "report_detail": report_detail,
+    "my_reports": my_reports,
+    "vote_toggle": vote_toggle,
+    "comment_thread": comment_thread,
+    "admin_stats": admin_stats,
+    "admin_timeseries": admin_timeseries,
+    "login_burst": login_burst,
+}
@@ -0,0 +1,119 @@
+"""
+Seed a benchmark database with realistic CivicTide data.
+
+Scale 1.0 is roughly a mature city deployment: 100k reports, 1M votes, 500k comments.
+Engagement is skewed towards a small set of "hot" reports, the way viral issues are
+in production, so thread and vote endpoints see realistic worst cases.
+
+Must be imported after DATABASE_URL has been set — see benchmarks/run.py.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+
+from app.db.database import Base, SessionLocal, engine, sync_schema
+import app.models  # noqa — register every table
+from app.models.user import User
+from app.models.report import Report, ReportStatus, ReportCategory
+from app.models.engagement import Vote, Comment
+from app.core.security import hash_password
+from app.services.analytics import rebuild_rollups
+from app.services.trending import rebuild_scores
+
+FULL_SCALE = {"users": 20_000, "reports": 100_000, "votes": 1_000_000, "comments": 500_000}
+PASSWORD = "benchmark-password"
+ADMIN_EMAIL = "admin@bench.civictide"
+CHUNK = 10_000
+
+# Accra, give or take
+LAT, LON = 5.6037, -0.1870
+
+
+def targets(scale: float) -> dict:
+    n = {name: max(10, int(count * scale)) for name, count in FULL_SCALE.items()}
+    # One vote per (user, report) — keep tiny scales satisfiable
+    n["votes"] = min(n["votes"], n["users"] * n["reports"] // 2)
+    return n
+
+
+def _insert(conn, table, rows):
+    for i in range(0, len(rows), CHUNK):
+        conn.execute(table.insert(), rows[i:i + CHUNK])
+
+
+def _hot_report(rng: random.Random, n_reports: int) -> int:
+    # Pareto-ish: a few reports collect most of the engagement
+    return min(n_reports, int(rng.paretovariate(1.2))) if rng.random() < 0.5 else rng.randint(1, n_reports)
+
+
+def is_seeded(scale: float) -> bool:
+    Base.metadata.create_all(bind=engine)
+    sync_schema()
+    db = SessionLocal()
+    try:
+        return db.query(Report).count() == targets(scale)["reports"]
+    finally:
+        db.close()
+
+
+def seed(scale: float, seed: int = 42) -> dict:
+    rng = random.Random(seed)
+    n = targets(scale)
+    now = datetime.now(timezone.utc)
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    hashed = hash_password(PASSWORD)  # bcrypt once, not once per user
+    users = [{
+        "full_name": "Bench Admin", "email": ADMIN_EMAIL, "hashed_password": hashed,
+        "is_active": True, "is_admin": True, "created_at": now,
+    }]
+    users += [{
+        "full_name": f"Citizen {i}", "email": f"user{i}@bench.civictide", "hashed_password": hashed,
+        "is_active": True, "is_admin": False, "created_at": now - timedelta(days=rng.randint(0, 400)),
+    } for i in range(1, n["users"])]
+
+    statuses = list(ReportStatus)
+    status_weights = [30, 15, 20, 30, 5]
+    reports = []
+    for i in range(n["reports"]):
+        created_at = now - timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+        reports.append({
+            "title": f"Issue #{i + 1}",
+            "description": "Burst pipe flooding the junction; water has been running for days. " * rng.randint(1, 6),
+            "category": rng.choice(list(ReportCategory)),
+            "status": rng.choices(statuses, status_weights)[0],
+            "latitude": LAT + rng.uniform(-0.2, 0.2),
+            "longitude": LON + rng.uniform(-0.2, 0.2),
+            "address": f"{rng.randint(1, 200)} Independence Ave, Accra",
+            "image_url": f"https://res.cloudinary.com/demo/image/upload/civictide/reports/{i}.jpg" if rng.random() < 0.6 else None,
+            "user_id": rng.randint(2, n["users"]),
+            "created_at": created_at,
+            "updated_at": created_at + timedelta(hours=rng.randint(1, 500)),
+        })
+
+    pairs = set()
+    while len(pairs) < n["votes"]:
+        pairs.add((rng.randint(1, n["users"]), _hot_report(rng, n["reports"])))
+    votes = [{"user_id": u, "report_id": r, "created_at": now} for u, r in pairs]
+
+    comments = [{
+        "content": "Same problem on our street — please prioritise this.",
+        "user_id": rng.randint(1, n["users"]),
+        "report_id": _hot_report(rng, n["reports"]),
+        "created_at": now - timedelta(minutes=rng.randint(0, 30 * 24 * 60)),
+    } for _ in range(n["comments"])]
+
+    with engine.begin() as conn:
+        _insert(conn, User.__table__, users)
+        _insert(conn, Report.__table__, reports)
+        _insert(conn, Vote.__table__, votes)
+        _insert(conn, Comment.__table__, comments)
+
+    db = SessionLocal()
+    try:
+        rebuild_rollups(db)
+        rebuild_scores(db)
+    finally:
+        db.close()
+    return n
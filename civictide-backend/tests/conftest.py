@@ -0,0 +1,93 @@
+"""
+Tests run against a throwaway SQLite file. Settings are read at import time, so the
+environment is set before anything from `app` is imported, and the directory is
+removed at the end of the session.
+"""
+import os
+import shutil
+import tempfile
+
+_tmp = tempfile.mkdtemp(prefix="civictide-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_tmp}/test.db",
+    "SECRET_KEY": "test-secret-key",
+    "RATE_LIMIT_ENABLED": "false",
+    "ARCHIVE_ENABLED": "false",
+    "ARCHIVE_BATCH_PAUSE_SECONDS": "0",
+    "IDEMPOTENCY_WAIT_SECONDS": "5",
+    "LOG_LEVEL": "WARNING",
+    "LOG_FORMAT": "text",
+})
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.core.security import create_access_token  # noqa: E402
+from app.db.database import Base, SessionLocal, engine  # noqa: E402
+from app.models.report import Report, ReportCategory  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.services.cache import comment_first_pages  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def remove_test_database():
+    yield
+    engine.dispose()
+    shutil.rmtree(_tmp, ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    yield
+    with engine.begin() as conn:
+        for table in reversed(Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    comment_first_pages.clear()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client():
+    # Not used as a context manager: the lifespan's periodic jobs have no place in tests
+    return TestClient(app)
+
+
+@pytest.fixture
+def user(db):
+    u = User(full_name="Ada Citizen", email="ada@example.com", hashed_password="x")
+    db.add(u)
+    db.commit()
+    return u
+
+
+@pytest.fixture
+def auth_headers(user):
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(user.id)})}"}
+
+
+@pytest.fixture
+def admin_headers(db):
+    admin = User(full_name="Ama Admin", email="ama@example.com", hashed_password="x", is_admin=True)
+    db.add(admin)
+    db.commit()
+    return {"Authorization": f"Bearer {create_access_token({'sub': str(admin.id)})}"}
+
+
+@pytest.fixture
+def make_report(db, user):
+    def make(**fields):
+        report = Report(**{
+            "title": "Pothole", "description": "Deep pothole on Main St", "category": ReportCategory.ROAD_DAMAGE,
+            "latitude": 5.6, "longitude": -0.2, "user_id": user.id, **fields,
+        })
+        db.add(report)
+        db.commit()
+        return report
+    return make
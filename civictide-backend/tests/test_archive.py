@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.analytics import (
+    DailyCategoryRollup, DailyResolutionRollup, DailyStatusRollup, ReportStatusHistory,
+)
+from app.models.archive import ArchivedComment, ArchivedReport, ArchivedStatusHistory, ArchivedVote
+from app.models.engagement import Comment, Vote
+from app.models.report import Report, ReportStatus
+from app.services import analytics, archive, trending
+
+LONG_AGO = datetime(2020, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def closed_id(db, user, make_report):
+    """Id of a report resolved years ago, with a vote, two comments and its status history."""
+    report = make_report(status=ReportStatus.RESOLVED, created_at=LONG_AGO, updated_at=LONG_AGO)
+    db.add_all([
+        ReportStatusHistory(report_id=report.id, from_status=None, to_status=ReportStatus.REPORTED,
+                            changed_by=user.id, changed_at=LONG_AGO),
+        ReportStatusHistory(report_id=report.id, from_status=ReportStatus.REPORTED, to_status=ReportStatus.RESOLVED,
+                            changed_at=LONG_AGO + timedelta(hours=5)),
+        Vote(user_id=user.id, report_id=report.id),
+        Comment(content="Reported to the council", user_id=user.id, report_id=report.id),
+        Comment(content="Fixed now", user_id=user.id, report_id=report.id),
+    ])
+    db.commit()
+    return report.id
+
+
+def rollups(db):
+    return {
+        model.__tablename__: sorted(tuple(getattr(row, c.name) for c in model.__table__.columns if c.name != "id")
+                                    for row in db.query(model))
+        for model in (DailyCategoryRollup, DailyStatusRollup, DailyResolutionRollup)
+    }
+
+
+def test_moves_the_report_and_everything_hanging_off_it(db, closed_id, make_report):
+    open_report = make_report()
+
+    result = archive.archive_all(db)
+
+    assert result["batches"] == 1
+    assert result["reports"] == 1 and result["votes"] == 1 and result["comments"] == 2
+    assert [r.id for r in db.query(Report)] == [open_report.id]
+    for hot in (Vote, Comment, ReportStatusHistory):
+        assert db.query(hot).count() == 0
+    assert db.get(ArchivedReport, closed_id).created_at is not None
+    assert db.query(ArchivedVote).count() == 1
+    assert db.query(ArchivedComment).count() == 2
+    assert db.query(ArchivedStatusHistory).count() == 2
+
+
+def test_recently_closed_reports_stay(db, make_report):
+    make_report(status=ReportStatus.RESOLVED)
+    assert archive.archive_all(db)["batches"] == 0
+    assert db.query(Report).count() == 1
+
+
+def test_resumes_where_the_last_run_stopped(db, make_report, monkeypatch):
+    monkeypatch.setattr(archive.settings, "ARCHIVE_BATCH_SIZE", 2)
+    for _ in range(5):
+        make_report(status=ReportStatus.REJECTED, created_at=LONG_AGO, updated_at=LONG_AGO)
+
+    assert archive.archive_all(db, max_batches=1)["reports"] == 2
+    assert archive.archive_all(db)["reports"] == 3
+    assert db.query(Report).count() == 0 and db.query(ArchivedReport).count() == 5
+
+
+def test_engagement_does_not_reset_the_archive_clock(db, closed_id):
+    trending.record_vote(db, closed_id)
+    trending.record_comment(db, closed_id)
+    db.commit()
+    assert archive.archive_all(db)["reports"] == 1
+
+
+def test_archived_report_is_still_served(client, db, closed_id, auth_headers):
+    before = client.get(f"/api/reports/{closed_id}").json()
+    first_page = client.get(f"/api/engagement/reports/{closed_id}/comments").json()  # now cached
+    archive.archive_all(db)
+
+    url = f"/api/engagement/reports/{closed_id}"
+    assert client.get(f"/api/reports/{closed_id}").json() == before
+    assert client.get(f"{url}/comments").json() == first_page
+    assert [c["content"] for c in client.get(f"{url}/comments", params={"order": "newest"}).json()] == \
+        ["Fixed now", "Reported to the council"]
+    assert client.get(f"{url}/votes", headers=auth_headers).json() == \
+        {"report_id": closed_id, "vote_count": 1, "user_has_voted": True}
+
+
+def test_archived_thread_pages_with_its_cursor(client, db, closed_id):
+    archive.archive_all(db)
+    url = f"/api/engagement/reports/{closed_id}/comments"
+
+    first = client.get(url, params={"limit": 1})
+    rest = client.get(url, params={"limit": 1, "cursor": first.headers["X-Next-Cursor"]})
+
+    assert [c["content"] for c in first.json() + rest.json()] == ["Reported to the council", "Fixed now"]
+    assert "X-Next-Cursor" not in rest.headers
+
+
+def test_archived_report_takes_no_new_engagement(client, db, closed_id, auth_headers):
+    archive.archive_all(db)
+    url = f"/api/engagement/reports/{closed_id}"
+
+    assert client.post(f"{url}/vote", headers=auth_headers).status_code == 409
+    assert client.post(f"{url}/comments", json={"content": "Still broken"}, headers=auth_headers).status_code == 409
+
+
+def test_my_reports_include_archived(client, db, closed_id, make_report, auth_headers):
+    newer = make_report()
+    before = client.get("/api/reports/my/reports", headers=auth_headers).json()
+    archive.archive_all(db)
+    after = client.get("/api/reports/my/reports", headers=auth_headers).json()
+
+    assert after == before
+    assert after["total"] == 2 and after["by_status"]["resolved"] == 1
+    assert [r["id"] for r in after["reports"]] == [newer.id, closed_id]
+    assert after["reports"][1]["author_name"] == "Ada Citizen"
+
+
+def test_admin_stats_and_rollups_unchanged(client, db, closed_id, admin_headers):
+    analytics.rebuild_rollups(db)
+    stats_before, rollups_before = client.get("/api/admin/stats", headers=admin_headers).json(), rollups(db)
+
+    archive.archive_all(db)
+    analytics.rebuild_rollups(db)
+    stats_after = client.get("/api/admin/stats", headers=admin_headers).json()
+
+    assert stats_after == {**stats_before, "archived": 1}
+    assert rollups(db) == rollups_before
+
+
+def test_new_reports_never_reuse_an_archived_id(client, db, closed_id, make_report):
+    archive.archive_all(db)  # closed_id was the highest id
+    newer = make_report(status=ReportStatus.RESOLVED, created_at=LONG_AGO, updated_at=LONG_AGO)
+
+    assert newer.id > closed_id
+    assert client.get(f"/api/reports/{closed_id}").json()["status"] == "resolved"
+    assert client.get(f"/api/engagement/reports/{newer.id}/comments").json() == []
+    assert archive.archive_all(db)["reports"] == 1  # no clash in archived_reports
@@ -0,0 +1,90 @@
+import base64
+
+from sqlalchemy import literal_column
+
+from app.models.engagement import Comment
+from app.services.cache import TTLCache
+
+
+def add_comments(db, report, user, n, created_at="2026-01-01 10:00:38"):
+    # Stored the way SQLite's server default stores them — whole seconds, no fraction
+    for i in range(n):
+        db.add(Comment(content=f"comment {i}", user_id=user.id, report_id=report.id,
+                       created_at=literal_column(f"'{created_at}'")))
+    db.commit()
+
+
+def read_thread(client, report_id, order, limit):
+    ids, cursor = [], None
+    for _ in range(20):  # a cursor that repeats a page must fail, not hang
+        params = {"order": order, "limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(f"/api/engagement/reports/{report_id}/comments", params=params)
+        assert response.status_code == 200
+        ids += [c["id"] for c in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids
+    raise AssertionError(f"thread did not end after 20 pages: {ids}")
+
+
+def test_pages_cover_a_thread_sharing_one_second(client, db, user, make_report):
+    report = make_report()
+    add_comments(db, report, user, 55)
+
+    oldest_first = read_thread(client, report.id, "oldest", 20)
+    newest_first = read_thread(client, report.id, "newest", 20)
+
+    assert len(oldest_first) == 55 and len(set(oldest_first)) == 55
+    assert oldest_first == sorted(oldest_first)
+    assert newest_first == oldest_first[::-1]
+
+
+def test_cursor_survives_deleting_its_comment(client, db, user, make_report, auth_headers):
+    report = make_report()
+    add_comments(db, report, user, 5)
+    first = client.get(f"/api/engagement/reports/{report.id}/comments", params={"limit": 2})
+    cursor = first.headers["X-Next-Cursor"]
+
+    last_seen = first.json()[-1]["id"]
+    assert client.delete(f"/api/engagement/comments/{last_seen}", headers=auth_headers).status_code == 204
+
+    rest = client.get(f"/api/engagement/reports/{report.id}/comments", params={"limit": 10, "cursor": cursor})
+    assert [c["id"] for c in rest.json()] == [last_seen + 1, last_seen + 2, last_seen + 3]
+
+
+def test_invalid_cursor_is_rejected(client, make_report):
+    report = make_report()
+    cursor = base64.urlsafe_b64encode(b"not-a-cursor").decode()
+    response = client.get(f"/api/engagement/reports/{report.id}/comments", params={"cursor": cursor})
+    assert response.status_code == 400
+
+
+def test_new_comment_invalidates_cached_first_page(client, make_report, auth_headers):
+    report = make_report()
+    assert client.get(f"/api/engagement/reports/{report.id}/comments").json() == []
+
+    client.post(f"/api/engagement/reports/{report.id}/comments", json={"content": "Still there"},
+                headers=auth_headers)
+
+    assert [c["content"] for c in client.get(f"/api/engagement/reports/{report.id}/comments").json()] == ["Still there"]
+
+
+def test_cache_drops_values_computed_before_an_invalidation():
+    cache = TTLCache(maxsize=2)
+    version = cache.version("thread")
+    cache.pop("thread")  # a write lands while the reader is still querying
+    cache.set("thread", "stale page", version=version)
+    assert cache.get("thread") is None
+
+    cache.set("thread", "fresh page", version=cache.version("thread"))
+    assert cache.get("thread") == "fresh page"
+
+
+def test_cache_version_survives_forgetting_keys():
+    cache = TTLCache(maxsize=1)
+    version = cache.version("a")
+    cache.pop("a")
+    cache.pop("b")  # evicts "a" from the version table
+    cache.set("a", "stale page", version=version)
+    assert cache.get("a") is None
+
@@ -0,0 +1,107 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from starlette.responses import JSONResponse, Response, StreamingResponse
+
+from app.core import compression
+from app.core.compression import CompressionMiddleware, accepted_encodings
+
+BIG = {"reports": [{"id": i, "title": "Pothole on Main St", "status": "reported"} for i in range(100)]}
+
+
+def respond_with(response):
+    async def app(scope, receive, send):
+        await response(scope, receive, send)
+    return app
+
+
+def call(app, accept_encoding="gzip"):
+    """Run one GET through the middleware; returns (start message, body messages)."""
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    asyncio.run(CompressionMiddleware(app, minimum_size=1024)(scope, receive, send))
+    return messages[0], messages[1:]
+
+
+def headers_of(start):
+    return {name.decode(): value.decode() for name, value in start["headers"]}
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("gzip, br", {"gzip", "br"}),
+    ("gzip;q=0, br", {"br"}),
+    ("GZIP; q=0.5, identity;q=0", {"gzip"}),
+    ("gzip;q=nonsense", set()),
+    ("", set()),
+])
+def test_accepted_encodings(header, expected):
+    assert accepted_encodings(header) == expected
+
+
+def test_large_json_is_gzipped_with_length_and_vary():
+    start, body = call(respond_with(JSONResponse(BIG)))
+    headers = headers_of(start)
+
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert int(headers["content-length"]) == len(body[0]["body"])
+    assert json.loads(gzip.decompress(body[0]["body"])) == BIG
+
+
+def test_brotli_is_preferred_when_available():
+    if compression.brotli is None:
+        pytest.skip("brotli not installed")
+    start, body = call(respond_with(JSONResponse(BIG)), accept_encoding="gzip, br")
+
+    assert headers_of(start)["content-encoding"] == "br"
+    assert json.loads(compression.brotli.decompress(body[0]["body"])) == BIG
+
+
+def test_gzip_refused_with_q0_is_not_used():
+    start, _ = call(respond_with(JSONResponse(BIG)), accept_encoding="gzip;q=0")
+    assert "content-encoding" not in headers_of(start)
+
+
+def test_small_bodies_are_sent_as_is():
+    start, body = call(respond_with(JSONResponse({"id": 1})))
+    assert "content-encoding" not in headers_of(start)
+    assert body[0]["body"] == b'{"id":1}'
+
+
+@pytest.mark.parametrize("response", [
+    Response(b"\x89PNG" + bytes(4000), media_type="image/png"),
+    Response(gzip.compress(json.dumps(BIG).encode()), media_type="application/json",
+             headers={"Content-Encoding": "gzip"}),
+], ids=["image", "already-encoded"])
+def test_incompressible_or_encoded_bodies_pass_through(response):
+    original = response.body
+    start, body = call(respond_with(response))
+
+    assert headers_of(start).get("content-encoding") == response.headers.get("content-encoding")
+    assert body[0]["body"] == original
+
+
+def test_streaming_response_is_compressed_chunk_by_chunk():
+    # Through TestClient: StreamingResponse needs a real client to listen for disconnects
+    chunks = [json.dumps(BIG["reports"][i:i + 10]).encode() for i in range(0, 100, 10)]
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    app = CompressionMiddleware(respond_with(StreamingResponse(stream(), media_type="application/json")))
+    response = TestClient(app).get("/", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.content == b"".join(chunks)  # decoded by the client
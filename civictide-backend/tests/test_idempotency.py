@@ -0,0 +1,156 @@
+import json
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import HTTPException
+
+from app.db.database import SessionLocal
+from app.models.engagement import Comment, Vote
+from app.models.idempotency import IdempotencyKey
+from app.models.user import User
+from app.schemas.engagement import VoteOut
+from app.services import idempotency
+
+ENDPOINT = "POST /engagement/vote"
+
+
+def comment_url(report):
+    return f"/api/engagement/reports/{report.id}/comments"
+
+
+# ── Through the routes ─────────────────────────────────
+
+def test_retried_comment_is_replayed_not_duplicated(client, db, make_report, auth_headers):
+    report = make_report()
+    headers = {**auth_headers, "Idempotency-Key": "comment-1"}
+
+    first = client.post(comment_url(report), json={"content": "Blocked drain"}, headers=headers)
+    retry = client.post(comment_url(report), json={"content": "Blocked drain"}, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first.headers
+    assert db.query(Comment).count() == 1
+
+
+def test_retried_vote_toggle_does_not_flip_back(client, db, make_report, auth_headers):
+    report = make_report()
+    headers = {**auth_headers, "Idempotency-Key": "vote-1"}
+    url = f"/api/engagement/reports/{report.id}/vote"
+
+    assert client.post(url, headers=headers).json()["user_has_voted"] is True
+    assert client.post(url, headers=headers).json()["user_has_voted"] is True
+    assert db.query(Vote).count() == 1
+
+
+def test_key_reused_for_a_different_request_is_rejected(client, make_report, auth_headers):
+    report = make_report()
+    headers = {**auth_headers, "Idempotency-Key": "comment-2"}
+
+    client.post(comment_url(report), json={"content": "First"}, headers=headers)
+    response = client.post(comment_url(report), json={"content": "Something else"}, headers=headers)
+
+    assert response.status_code == 422
+
+
+def test_failed_attempt_releases_its_key(client, db, make_report, auth_headers):
+    headers = {**auth_headers, "Idempotency-Key": "comment-3"}
+    response = client.post("/api/engagement/reports/999999/comments", json={"content": "Hi"}, headers=headers)
+
+    assert response.status_code == 404
+    assert db.query(IdempotencyKey).count() == 0
+
+
+def test_requests_without_a_key_are_not_deduplicated(client, db, make_report, auth_headers):
+    report = make_report()
+    for _ in range(2):
+        client.post(comment_url(report), json={"content": "Same words"}, headers=auth_headers)
+    assert db.query(Comment).count() == 2
+
+
+# ── claim() directly ───────────────────────────────────
+
+def test_concurrent_duplicate_waits_for_the_first_attempt(db, user):
+    fp = idempotency.fingerprint(1)
+    first = idempotency.claim(db, "k", user.id, ENDPOINT, fp)
+    assert first.replay is None
+
+    result = {}
+
+    def duplicate():
+        other = SessionLocal()
+        try:
+            result["claim"] = idempotency.claim(other, "k", user.id, ENDPOINT, fp)
+        finally:
+            other.close()
+
+    waiter = threading.Thread(target=duplicate)
+    waiter.start()
+    time.sleep(0.3)
+    assert waiter.is_alive()  # polling, not inserting a second row
+
+    first.complete(200, VoteOut(report_id=1, vote_count=3, user_has_voted=True))
+    db.commit()
+    waiter.join(timeout=5)
+
+    replay = result["claim"].replay
+    assert replay.status_code == 200
+    assert json.loads(replay.body) == {"report_id": 1, "vote_count": 3, "user_has_voted": True}
+    assert replay.headers["Idempotent-Replayed"] == "true"
+
+
+def test_duplicate_gives_up_with_409_while_first_attempt_runs(db, user, monkeypatch):
+    monkeypatch.setattr(idempotency.settings, "IDEMPOTENCY_WAIT_SECONDS", 0.3)
+    fp = idempotency.fingerprint(1)
+    idempotency.claim(db, "k", user.id, ENDPOINT, fp)
+
+    other = SessionLocal()
+    try:
+        with pytest.raises(HTTPException) as exc:
+            idempotency.claim(other, "k", user.id, ENDPOINT, fp)
+    finally:
+        other.close()
+    assert exc.value.status_code == 409
+
+
+def test_abandoned_in_flight_key_can_be_claimed_again(db, user):
+    db.add(IdempotencyKey(
+        user_id=user.id, endpoint=ENDPOINT, key="k", fingerprint=idempotency.fingerprint(1),
+        expires_at=datetime.now(timezone.utc) - timedelta(seconds=1),  # its worker died
+    ))
+    db.commit()
+
+    claim = idempotency.claim(db, "k", user.id, ENDPOINT, idempotency.fingerprint(1))
+
+    assert claim.replay is None and claim.row is not None
+    assert db.query(IdempotencyKey).count() == 1
+
+
+def test_released_key_can_be_claimed_again(db, user):
+    fp = idempotency.fingerprint(1)
+    idempotency.claim(db, "k", user.id, ENDPOINT, fp).release()
+
+    claim = idempotency.claim(db, "k", user.id, ENDPOINT, fp)
+    assert claim.replay is None and claim.row is not None
+
+
+def test_keys_are_scoped_per_user(db, user):
+    neighbour = User(full_name="Kofi Neighbour", email="kofi@example.com", hashed_password="x")
+    db.add(neighbour)
+    db.commit()
+    fp = idempotency.fingerprint(1)
+    idempotency.claim(db, "k", user.id, ENDPOINT, fp)
+    assert idempotency.claim(db, "k", neighbour.id, ENDPOINT, fp).replay is None
+
+
+def test_purge_removes_only_expired_keys(db, user):
+    now = datetime.now(timezone.utc)
+    for key, expires_at in [("old", now - timedelta(minutes=1)), ("live", now + timedelta(minutes=1))]:
+        db.add(IdempotencyKey(user_id=user.id, endpoint=ENDPOINT, key=key, fingerprint="x", expires_at=expires_at))
+    db.commit()
+
+    assert idempotency.purge_expired(db) == 1
+    assert [k.key for k in db.query(IdempotencyKey)] == ["live"]
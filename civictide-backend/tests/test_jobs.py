@@ -0,0 +1,22 @@
+from app.core.jobs import JobsLock
+
+
+def test_only_one_holder_until_released(tmp_path):
+    url = f"sqlite:///{tmp_path}/jobs.db"
+    leader, follower = JobsLock(url, {}, lock_dir=tmp_path), JobsLock(url, {}, lock_dir=tmp_path)
+
+    assert leader.acquire()
+    assert leader.acquire()  # re-entrant for the jobs of the same process
+    assert not follower.acquire()
+
+    leader.release()
+    assert follower.acquire()
+    follower.release()
+
+
+def test_databases_do_not_share_a_lock(tmp_path):
+    first = JobsLock(f"sqlite:///{tmp_path}/a.db", {}, lock_dir=tmp_path)
+    second = JobsLock(f"sqlite:///{tmp_path}/b.db", {}, lock_dir=tmp_path)
+    assert first.acquire() and second.acquire()
+    first.release()
+    second.release()
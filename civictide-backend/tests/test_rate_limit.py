@@ -0,0 +1,169 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+
+from app.core import rate_limit
+from app.core.metrics import MetricsMiddleware
+from app.core.rate_limit import ConcurrencyLimitMiddleware, InMemoryStore, RateLimitMiddleware, RateLimitRule
+
+LOGIN = "POST /api/auth/login"
+
+
+async def ok(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+def limited_client(limits, store=None, **options):
+    return TestClient(RateLimitMiddleware(ok, limits=limits, store=store or InMemoryStore(), **options))
+
+
+def login(client, forwarded_for=None):
+    headers = {"X-Forwarded-For": forwarded_for} if forwarded_for else {}
+    return client.post("/api/auth/login", headers=headers).status_code
+
+
+# ── Token bucket ───────────────────────────────────────
+
+def test_bucket_refills_at_its_rate(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    store = InMemoryStore()
+
+    def take():
+        return asyncio.run(store.take("k", 2, 0.5))  # 2 tokens, one back every 2s
+
+    assert take() == 0 and take() == 0
+    assert take() == pytest.approx(2.0)  # empty: the next token is 2s away
+
+    now[0] += 1.0
+    assert take() == pytest.approx(1.0)  # half a token back, still short
+    now[0] += 1.0
+    assert take() == 0
+
+
+def test_full_buckets_are_evicted_first(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit.time, "monotonic", lambda: now[0])
+    store = InMemoryStore(max_keys=2)
+    asyncio.run(store.take("idle", 1, 1.0))
+    asyncio.run(store.take("busy", 100, 0.01))
+
+    now[0] += 5.0
+    asyncio.run(store.take("new", 1, 1.0))
+
+    assert set(store.buckets) == {"busy", "new"}
+
+
+# ── Rules ──────────────────────────────────────────────
+
+def test_rule_matches_the_route_template_only():
+    rule = RateLimitRule("POST /api/engagement/reports/{report_id}/vote", "30/minute")
+
+    assert rule.matches("POST", "/api/engagement/reports/5/vote")
+    assert rule.matches("POST", "/api/engagement/reports/5/vote/")
+    assert not rule.matches("POST", "/api/engagement/reports/5/votes")
+    assert not rule.matches("POST", "/api/engagement/reports/5/6/vote")
+    assert not rule.matches("GET", "/api/engagement/reports/5/vote")
+
+
+@pytest.mark.parametrize("limit, capacity, rate", [
+    ("30/minute", 30, 0.5), ("1/second", 1, 1.0), ("120 / hours", 120, 120 / 3600), ("24/day", 24, 24 / 86400),
+])
+def test_rule_parses_limits(limit, capacity, rate):
+    rule = RateLimitRule("POST /api/reports", limit)
+    assert (rule.capacity, rule.rate) == (capacity, pytest.approx(rate))
+
+
+# ── Middleware ─────────────────────────────────────────
+
+def test_over_the_limit_gets_429_with_retry_after():
+    client = limited_client({LOGIN: "2/minute"})
+
+    assert login(client) == login(client) == 200
+    response = client.post("/api/auth/login")
+
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "30"
+
+
+def test_unlimited_routes_pass_through():
+    client = limited_client({LOGIN: "1/minute"})
+    assert [client.get("/api/auth/login").status_code for _ in range(3)] == [200, 200, 200]
+
+
+def test_fails_open_when_the_store_breaks():
+    class BrokenStore:
+        async def take(self, key, capacity, rate):
+            raise ConnectionError("redis is down")
+
+    client = limited_client({LOGIN: "1/minute"}, store=BrokenStore())
+    assert login(client) == login(client) == 200
+
+
+def test_sheds_load_beyond_the_concurrency_limit():
+    middleware = ConcurrencyLimitMiddleware(ok, max_concurrent=1, exempt_paths=("/", "/health", "/metrics"))
+    client = TestClient(middleware)
+    assert client.get("/api/reports").status_code == 200
+    assert middleware.in_flight == 0
+
+    middleware.in_flight = 1  # one request already running
+    response = client.get("/api/reports")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert client.get("/health").status_code == 200
+    assert client.get("/metrics").status_code == 200
+
+
+def test_rejections_are_labelled_with_their_route():
+    routes = [Route("/api/engagement/reports/{report_id}/vote", ok, methods=["POST"])]
+    limiter = RateLimitMiddleware(ok, limits={"POST /api/engagement/reports/{report_id}/vote": "1/minute"},
+                                  store=InMemoryStore())
+    shedder = ConcurrencyLimitMiddleware(limiter, max_concurrent=1, routes=routes)
+    client = TestClient(MetricsMiddleware(shedder, routes=routes))
+    route = "/api/engagement/reports/{report_id}/vote"
+
+    def sample(name, **labels):
+        return REGISTRY.get_sample_value(name, {"route": route, **labels}) or 0
+
+    before = {
+        "limited": sample("civictide_http_requests_rejected_total", reason="rate_limited"),
+        "shed": sample("civictide_http_requests_rejected_total", reason="overloaded"),
+        "latency": sample("civictide_http_request_duration_seconds_count", method="POST", status="429"),
+    }
+    client.post("/api/engagement/reports/5/vote")
+    assert client.post("/api/engagement/reports/6/vote").status_code == 429  # the bucket is per route
+    shedder.in_flight = 1
+    assert client.post("/api/engagement/reports/5/vote").status_code == 503
+
+    assert sample("civictide_http_requests_rejected_total", reason="rate_limited") == before["limited"] + 1
+    assert sample("civictide_http_requests_rejected_total", reason="overloaded") == before["shed"] + 1
+    assert sample("civictide_http_request_duration_seconds_count", method="POST", status="429") == \
+        before["latency"] + 1
+
+
+# ── Client key ─────────────────────────────────────────
+
+def test_forwarded_clients_get_separate_buckets_behind_a_proxy():
+    client = limited_client({LOGIN: "1/minute"}, trusted_proxy_hops=1)
+
+    assert login(client, "203.0.113.7") == 200
+    assert login(client, "198.51.100.2") == 200
+    assert login(client, "203.0.113.7") == 429
+
+
+def test_forwarded_entries_left_of_the_trusted_hops_are_ignored():
+    client = limited_client({LOGIN: "1/minute"}, trusted_proxy_hops=1)
+
+    assert login(client, "10.0.0.1, 203.0.113.7") == 200
+    assert login(client, "10.0.0.2, 203.0.113.7") == 429  # the client made up the first entry
+
+
+def test_forwarded_for_is_ignored_without_trusted_proxies():
+    client = limited_client({LOGIN: "1/minute"})
+
+    assert login(client, "203.0.113.7") == 200
+    assert login(client, "198.51.100.2") == 429
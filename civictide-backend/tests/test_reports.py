@@ -0,0 +1,60 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.report import ReportStatus
+from app.services import archive
+
+LONG_AGO = datetime(2020, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def test_my_reports_pages_and_counts(client, make_report, auth_headers):
+    for status in [ReportStatus.REPORTED] * 3 + [ReportStatus.RESOLVED] * 2:
+        make_report(status=status)
+
+    first = client.get("/api/reports/my/reports", params={"limit": 3}, headers=auth_headers).json()
+    rest = client.get("/api/reports/my/reports", params={"skip": 3, "limit": 3}, headers=auth_headers).json()
+
+    assert first["total"] == 5
+    assert first["by_status"]["reported"] == 3 and first["by_status"]["resolved"] == 2
+    ids = [r["id"] for r in first["reports"] + rest["reports"]]
+    assert len(ids) == 5 and len(set(ids)) == 5
+
+
+@pytest.mark.parametrize("url", ["/api/reports/", "/api/reports/my/reports"])
+@pytest.mark.parametrize("limit", [0, -1, 101])
+def test_limit_out_of_range_is_rejected(client, auth_headers, url, limit):
+    assert client.get(url, params={"limit": limit}, headers=auth_headers).status_code == 422
+
+
+# ── Sparse fields ──────────────────────────────────────
+
+def test_fields_limits_the_list_to_the_requested_columns(client, make_report):
+    report = make_report()
+    body = client.get("/api/reports/", params={"fields": "status, latitude,author_name"}).json()
+
+    assert body["total"] == 1
+    assert body["reports"] == [
+        {"id": report.id, "status": "reported", "latitude": 5.6, "author_name": "Ada Citizen"},
+    ]
+
+
+def test_fields_on_a_single_report(client, make_report):
+    report = make_report()
+    body = client.get(f"/api/reports/{report.id}", params={"fields": "title"}).json()
+    assert body == {"id": report.id, "title": "Pothole"}
+
+
+def test_fields_on_an_archived_report(client, db, make_report):
+    report_id = make_report(status=ReportStatus.RESOLVED, created_at=LONG_AGO, updated_at=LONG_AGO).id
+    archive.archive_all(db)
+
+    body = client.get(f"/api/reports/{report_id}", params={"fields": "status,author_name"}).json()
+    assert body == {"id": report_id, "status": "resolved", "author_name": "Ada Citizen"}
+
+
+@pytest.mark.parametrize("url", ["/api/reports/", "/api/reports/1"])
+def test_unknown_field_is_rejected(client, url):
+    response = client.get(url, params={"fields": "title,password"})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown fields: password"
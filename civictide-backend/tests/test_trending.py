@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db.database import SessionLocal
+from app.models.report import Report, ReportStatus
+from app.services import trending
+
+LONG_AGO = datetime(2020, 3, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def reload(db, report_id) -> Report:
+    db.expire_all()
+    return db.get(Report, report_id)
+
+
+def as_utc(ts: datetime) -> datetime:
+    return ts.replace(tzinfo=timezone.utc) if ts.tzinfo is None else ts
+
+
+@pytest.fixture
+def old_report(make_report):
+    return make_report(status=ReportStatus.RESOLVED, created_at=LONG_AGO, updated_at=LONG_AGO,
+                       trending_score=1.0, trending_updated_at=datetime.now(timezone.utc))
+
+
+def test_events_and_decay_keep_updated_at(db, old_report):
+    trending.record_vote(db, old_report.id)
+    trending.record_comment(db, old_report.id)
+    db.commit()
+    trending.redecay_all(db)
+    trending.rebuild_scores(db)
+
+    assert as_utc(reload(db, old_report.id).updated_at) == LONG_AGO
+
+
+def test_vote_adds_to_the_stored_score(db, old_report):
+    trending.record_vote(db, old_report.id)
+    db.commit()
+    assert reload(db, old_report.id).trending_score == pytest.approx(2.0, rel=1e-3)
+
+
+def test_stale_reader_does_not_lose_a_vote(db, old_report):
+    # The second request read the report before the first one committed its vote
+    other = SessionLocal()
+    try:
+        other.get(Report, old_report.id)
+        trending.record_vote(db, old_report.id)
+        db.commit()
+        trending.record_vote(other, old_report.id)
+        other.commit()
+    finally:
+        other.close()
+
+    assert reload(db, old_report.id).trending_score == pytest.approx(3.0, rel=1e-3)
+
+
+def test_score_decays_by_half_life(db, make_report):
+    half_life_ago = datetime.now(timezone.utc) - timedelta(hours=trending.settings.TRENDING_HALF_LIFE_HOURS)
+    report = make_report(trending_score=4.0, trending_updated_at=half_life_ago)
+
+    trending.record_vote(db, report.id)
+    db.commit()
+
+    assert reload(db, report.id).trending_score == pytest.approx(3.0, rel=1e-3)
+
+
+def test_vote_toggle_route(client, db, old_report, auth_headers):
+    url = f"/api/engagement/reports/{old_report.id}/vote"
+    assert client.post(url, headers=auth_headers).json()["vote_count"] == 1
+    assert reload(db, old_report.id).trending_score == pytest.approx(2.0, rel=1e-3)
+
+    assert client.post(url, headers=auth_headers).json()["vote_count"] == 0
+    report = reload(db, old_report.id)
+    assert report.trending_score == pytest.approx(1.0, rel=1e-3)
+    assert as_utc(report.updated_at) == LONG_AGO